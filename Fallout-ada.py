@@ -13,10 +13,11 @@ posible de cápsulas RadAway mientras evita bombas, con un límite de [2n-1] mov
 
 Características Principales:
 - Implementación con Programación Dinámica y dos tipos de memoización
+- Motor bottom-up vectorizado con NumPy para cuadrículas grandes
 - Menú interactivo para seleccionar experimentos específicos
 - Generación aleatoria de cuadrículas en cada ejecución
 - Medición de tiempo y memoria con tracemalloc
-- Comparación automática entre métodos Array 3D vs Dictionary Hash
+- Comparación automática entre métodos Array 3D vs Dictionary Hash vs Vectorizado
 - Interfaz de usuario amigable con emojis y formateo mejorado
 
 Opciones de Ejecución:
@@ -27,22 +28,93 @@ Opciones de Ejecución:
 Requisitos:
 - Python 3.6+
 - Librerías estándar: random, time, tracemalloc, typing, sys
-- Librería adicional: matplotlib (para visualización de resultados)
+- Librería adicional: numpy (métodos vectorizados)
+- Librería adicional: matplotlib (para visualización de resultados, se importa solo al graficar)
 
 Uso:
     python Fallout-ada.py
+    python Fallout-ada.py --sizes 10 20 --trials 5 --seed 42 --format json --no-plot
 
-El programa iniciará un menú interactivo donde podrás elegir qué experimentos ejecutar.
+Sin argumentos el programa iniciará un menú interactivo donde podrás elegir qué
+experimentos ejecutar; con argumentos se ejecuta sin interacción (ver --help).
 """
 
+import argparse
+import csv
+import hashlib
+import heapq
+import json
 import random
 import time
 import tracemalloc
 from typing import List, Tuple, Dict, Optional, Any
+import os
 import sys
-import matplotlib.pyplot as plt
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
 import numpy as np
-from matplotlib.patches import Rectangle
+
+# Valor centinela para estados sin camino válido hacia el destino
+INF_NEG = -999999
+
+# Direcciones cardinales: arriba, derecha, abajo, izquierda. Los códigos de
+# movimiento de las tablas (y de los oráculos guardados) son índices en esta lista
+DIRECCIONES = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+# Marca de "sin camino" en tablas int16, donde INF_NEG no cabe
+SIN_CAMINO_H = -2
+
+# Distancia usada para celdas que la BFS no alcanza
+DIST_INF = 1 << 30
+
+# Contadores que agregan los solvers memoizados con instrumentar=True
+CONTADORES_MEMO = ('memo_hits', 'memo_misses', 'rechazos_limite_bomba', 'rechazos_tiempo',
+                   'llegadas_meta', 'podas_alcanzable', 'estados_guardados')
+
+# Densidad de bombas a partir de la cual resuelve_auto usa la frontera dispersa
+# (con menos bombas el motor vectorizado denso es más rápido; con más, la
+# frontera viva se vuelve pequeña y la dispersa gana por órdenes de magnitud)
+UMBRAL_FRONTERA_DISPERSA = 0.2
+
+# Conteo de caminos a partir del cual resuelve_conteo pasa de int64 a enteros de
+# Python: la suma de cuatro vecinos por debajo de este límite no desborda int64
+LIMITE_CONTEO_INT64 = 1 << 61
+
+# Códigos de celda de la representación compacta (un byte por celda)
+CELDA_VACIA = 0
+CELDA_RADAWAY = 1
+CELDA_BOMBA = 2
+_SIMBOLO_A_CODIGO = bytes.maketrans(b'.RB', bytes([CELDA_VACIA, CELDA_RADAWAY, CELDA_BOMBA]))
+_CODIGO_A_SIMBOLO = bytes.maketrans(bytes([CELDA_VACIA, CELDA_RADAWAY, CELDA_BOMBA]), b'.RB')
+
+
+def a_grid_compacto(grid: Any) -> np.ndarray:
+    """
+    Convierte una cuadrícula a su forma compacta: arreglo uint8 n×n en orden de filas.
+
+    Args:
+        grid: Lista de listas de 'B'/'R'/'.' (como la de random_map) o un arreglo
+            uint8 con códigos CELDA_*, que se retorna sin copiar
+
+    Returns:
+        Arreglo uint8 n×n con CELDA_VACIA, CELDA_RADAWAY o CELDA_BOMBA
+    """
+    if isinstance(grid, np.ndarray) and grid.dtype == np.uint8:
+        return grid
+    filas = [''.join(fila) for fila in (grid.tolist() if isinstance(grid, np.ndarray) else grid)]
+    texto = ''.join(filas).encode('ascii').translate(_SIMBOLO_A_CODIGO)
+    return np.frombuffer(bytearray(texto), dtype=np.uint8).reshape(len(filas), len(filas))
+
+
+def grid_desde_compacto(celdas: np.ndarray) -> List[List[str]]:
+    """
+    Adaptador inverso de a_grid_compacto: arreglo uint8 n×n a lista de listas de str.
+    """
+    n = celdas.shape[0]
+    texto = np.ascontiguousarray(celdas).tobytes().translate(_CODIGO_A_SIMBOLO).decode('ascii')
+    return [list(texto[i * n:(i + 1) * n]) for i in range(n)]
 
 
 class alg_optimizado:
@@ -53,7 +125,7 @@ class alg_optimizado:
     desde (0,0) hasta (n-1,n-1) maximizando la recolección de cápsulas RadAway.
     """
     
-    def __init__(self, grid: List[List[str]]):
+    def __init__(self, grid: List[List[str]], medir_memoria: bool = True):
         """
         Inicializa el optimizador con la cuadrícula del refugio.
         self hace referencia a la instancia actual de la clase.
@@ -62,18 +134,78 @@ class alg_optimizado:
                 'B' - Bomba (celda no transitable)
                 'R' - RadAway (cápsula recolectable)
                 '.' - Celda vacía transitable
+                También se acepta la forma compacta de a_grid_compacto.
+            medir_memoria: Si es False, los métodos no activan tracemalloc (que encarece
+                cada reserva de memoria) y reportan memory_peak = 0; lo usan los
+                benchmarks de tiempo
         """
-        self.grid = grid
-        self.n = len(grid)
+        # Representación compacta: un byte por celda, en orden de filas.
+        # Puede ser un numpy.memmap (cargar_grid_binario): no se copia al construir.
+        self.celdas = a_grid_compacto(grid)
+        self._grid = grid if isinstance(grid, list) else None
+        self._bombas: Optional[bytearray] = None
+        self._radaway: Optional[bytearray] = None
+        self.n = self.celdas.shape[0]
         self.max_steps = 2 * self.n - 1
         
         # Direcciones cardinales: arriba, derecha, abajo, izquierda
-        self.directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+        self.directions = DIRECCIONES
         
         # Estadísticas de rendimiento
         self.calls_count = 0
         self.memory_usage = 0
+        self.medir_memoria = medir_memoria
+
+        # Estado de resolver_incremental: tabla de valores con borde, forma
+        # (T+2, n+2, n+2), tabla de movimientos (T+1, n, n) y celdas editadas
+        self._celdas_propias = not isinstance(grid, np.ndarray)
+        self._valores: Optional[np.ndarray] = None
+        self._movimientos: Optional[np.ndarray] = None
+        self._celdas_editadas: List[Tuple[int, int]] = []
     
+    @property
+    def grid(self) -> List[List[str]]:
+        """
+        Cuadrícula como lista de listas de str, construida desde la forma compacta
+        solo si alguien la pide (por ejemplo mostrar_map).
+        """
+        if self._grid is None:
+            self._grid = grid_desde_compacto(self.celdas)
+        return self._grid
+
+    @property
+    def bombas(self) -> bytearray:
+        """
+        Máscara plana de bombas: bombas[x*n + y] vale 1 si la celda tiene bomba.
+        Se calcula la primera vez que un solver la necesita.
+        """
+        if self._bombas is None:
+            self._bombas = bytearray((self.celdas.reshape(-1) == CELDA_BOMBA).tobytes())
+        return self._bombas
+
+    @property
+    def radaway(self) -> bytearray:
+        """
+        Valor plano de RadAway: radaway[x*n + y] vale 1 si la celda tiene una cápsula.
+        Se calcula la primera vez que un solver la necesita.
+        """
+        if self._radaway is None:
+            self._radaway = bytearray((self.celdas.reshape(-1) == CELDA_RADAWAY).tobytes())
+        return self._radaway
+
+    def _iniciar_medicion_memoria(self) -> None:
+        """Inicia tracemalloc para la región medida, salvo con medir_memoria=False."""
+        if self.medir_memoria:
+            tracemalloc.start()
+
+    def _pico_memoria(self) -> int:
+        """Detiene tracemalloc y retorna el pico de memoria de la región medida (0 sin medición)."""
+        if not self.medir_memoria:
+            return 0
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return pico
+
     def posicion_valida(self, x: int, y: int) -> bool:
         """
         Verifica si una posición es válida dentro de la cuadrícula.
@@ -103,19 +235,314 @@ class alg_optimizado:
         min_distance = abs(self.n - 1 - x) + abs(self.n - 1 - y)
         return remaining_steps >= min_distance
 
-    def resuelve_con_array(self) -> Tuple[int, Dict, list]:
+    def _bfs_distancias(self, origen: Tuple[int, int], expandir_destino: bool) -> List[List[int]]:
+        """
+        Calcula distancias BFS desde `origen` evitando las celdas con bomba.
+
+        Args:
+            origen: Celda inicial de la búsqueda
+            expandir_destino: Si es False, (n-1,n-1) se alcanza pero no se atraviesa,
+                igual que en la recurrencia, donde el destino termina el camino
+
+        Returns:
+            Matriz n × n de distancias (DIST_INF para celdas no alcanzables)
+        """
+        n = self.n
+        bombas = self.bombas
+        dist = [[DIST_INF] * n for _ in range(n)]
+        ox, oy = origen
+        if bombas[ox * n + oy]:
+            return dist
+        dist[ox][oy] = 0
+        cola = deque([origen])
+        while cola:
+            x, y = cola.popleft()
+            if not expandir_destino and (x, y) == (n - 1, n - 1) and (x, y) != origen:
+                continue
+            for dx, dy in self.directions:
+                nx, ny = x + dx, y + dy
+                if (self.posicion_valida(nx, ny) and not bombas[nx * n + ny]
+                        and dist[nx][ny] == DIST_INF):
+                    dist[nx][ny] = dist[x][y] + 1
+                    cola.append((nx, ny))
+        return dist
+
+    def preprocesar_alcanzabilidad(self) -> Dict:
+        """
+        Calcula, para cada t, los estados alcanzables desde (0,0) y que aún llegan a (n-1,n-1).
+
+        Un estado (x,y,t) es alcanzable hacia adelante si t >= dist_inicio[x][y] y
+        ambos tienen la misma paridad (la cuadrícula es bipartita y siempre se puede
+        ir y volver por la última arista). Llega a tiempo al destino si
+        dist_meta[x][y] <= max_steps - t. Ambas distancias respetan las bombas,
+        a diferencia de la distancia Manhattan de es_alcanzable.
+
+        Returns:
+            Estadísticas de la poda: estados del espacio completo n·n·(2n),
+            estados en la intersección y estados podados
+        """
+        n = self.n
+        self.dist_inicio = self._bfs_distancias((0, 0), expandir_destino=False)
+        self.dist_meta = self._bfs_distancias((n - 1, n - 1), expandir_destino=True)
+
+        estados_totales = n * n * (self.max_steps + 1)
+        estados_interseccion = sum(self.cupos_estado(x, y) for x in range(n) for y in range(n))
+        return {
+            'estados_totales': estados_totales,
+            'estados_interseccion': estados_interseccion,
+            'estados_podados': estados_totales - estados_interseccion
+        }
+
+    def cupos_estado(self, x: int, y: int) -> int:
+        """
+        Cuenta los pasos t en los que (x,y) pertenece a la intersección.
+
+        Requiere haber llamado a preprocesar_alcanzabilidad(). Los t válidos son
+        dist_inicio, dist_inicio + 2, ..., hasta max_steps - dist_meta.
+        """
+        primero = self.dist_inicio[x][y]
+        ultimo = self.max_steps - self.dist_meta[x][y]
+        return (ultimo - primero) // 2 + 1 if ultimo >= primero else 0
+
+    def en_interseccion(self, x: int, y: int, t: int) -> bool:
+        """
+        Versión exacta de es_alcanzable basada en preprocesar_alcanzabilidad().
+
+        Returns:
+            True si (x,y,t) es alcanzable desde (0,0) y aún puede llegar al destino
+        """
+        primero = self.dist_inicio[x][y]
+        return (primero <= t and (t - primero) % 2 == 0
+                and self.dist_meta[x][y] <= self.max_steps - t)
+
+    def mascara_libres(self) -> int:
+        """
+        Empaqueta las celdas sin bomba en un entero de Python, fila por fila.
+
+        La fila x ocupa los bits x*(n+1) .. x*(n+1)+n-1; el bit x*(n+1)+n queda en
+        cero como guarda, para que los desplazamientos de un bit no pasen de una
+        fila a la siguiente.
+
+        Returns:
+            Máscara con el bit x*(n+1)+y encendido si (x,y) no tiene bomba
+        """
+        n = self.n
+        con_guarda = np.zeros((n, n + 1), dtype=bool)
+        con_guarda[:, :n] = self.celdas != CELDA_BOMBA
+        return int.from_bytes(np.packbits(con_guarda.ravel(), bitorder='little').tobytes(), 'little')
+
+    def _paso_bits(self, frontera: int, libres: int) -> int:
+        """Celdas libres a un movimiento de alguna celda de `frontera`."""
+        ancho = self.n + 1
+        return ((frontera << 1) | (frontera >> 1) | (frontera << ancho) | (frontera >> ancho)) & libres
+
+    def alcanzables_por_paso(self, hasta: Optional[int] = None) -> List[int]:
+        """
+        Calcula, para cada t, la máscara de celdas en las que se puede estar tras
+        exactamente t movimientos desde (0,0), con desplazamientos y AND sobre
+        mascara_libres() (una iteración por paso).
+
+        El destino termina el camino, así que aparece en la capa en que se alcanza
+        pero no se expande. (x,y,t) sirve para podar si su bit x*(n+1)+y está
+        apagado en la capa t (ver alcanzable_bits).
+
+        Args:
+            hasta: Último paso a calcular (por defecto max_steps)
+
+        Returns:
+            Lista de máscaras, una por t = 0..hasta
+        """
+        hasta = self.max_steps if hasta is None else hasta
+        libres = self.mascara_libres()
+        bit_meta = 1 << ((self.n - 1) * (self.n + 1) + self.n - 1)
+        capas = [libres & 1]
+        for _ in range(hasta):
+            capas.append(self._paso_bits(capas[-1] & ~bit_meta, libres))
+        self.capas_alcanzables = capas
+        return capas
+
+    def alcanzable_bits(self, x: int, y: int, t: int) -> bool:
+        """
+        Versión de es_alcanzable que además exige que (x,y,t) sea alcanzable desde
+        (0,0). Requiere haber llamado a alcanzables_por_paso().
+        """
+        return bool((self.capas_alcanzables[t] >> (x * (self.n + 1) + y)) & 1) and self.es_alcanzable(x, y, t)
+
+    def es_factible(self) -> bool:
+        """
+        Comprueba con bitsets si (n-1,n-1) se alcanza desde (0,0) en max_steps pasos
+        o menos, sin correr ninguna programación dinámica.
+
+        Returns:
+            True si existe al menos un camino válido hasta el destino
+        """
+        n = self.n
+        libres = self.mascara_libres()
+        bit_meta = 1 << ((n - 1) * (n + 1) + n - 1)
+        frontera = libres & 1
+        visitadas = frontera
+        for _ in range(self.max_steps):
+            if frontera & bit_meta:
+                return True
+            # Basta con la primera llegada a cada celda: la distancia BFS es la mínima
+            frontera = self._paso_bits(frontera, libres) & ~visitadas
+            if not frontera:
+                return False
+            visitadas |= frontera
+        return bool(frontera & bit_meta)
+
+    def _descarte_infactible(self, metodo: str, **extra: Any) -> Optional[Tuple[int, Dict, list]]:
+        """
+        Descarte temprano con bitsets que corre cada solver antes de reservar tablas.
+
+        Args:
+            metodo: Nombre del método para stats['method']
+            extra: Estadísticas propias del solver, con su valor para "sin camino"
+
+        Returns:
+            None si hay camino; si no, el resultado vacío (0, stats, []) con
+            stats['factible'] = False
+        """
+        inicio = time.time()
+        if self.es_factible():
+            return None
+        self.calls_count = 0
+        stats = {
+            'execution_time': time.time() - inicio,
+            'memory_peak': 0,
+            'function_calls': 0,
+            'method': metodo,
+            'factible': False
+        }
+        stats.update(extra)
+        return 0, stats, []
+
+    def _contadores_memo(self, estados: Any, alcanzable: Any) -> Dict:
+        """
+        Reconstruye los contadores de instrumentación a partir de los estados memoizados.
+
+        Cada estado guardado fue un fallo de memo que luego evaluó a sus cuatro vecinos,
+        y la clasificación de cada llamada (límites/bomba, tiempo, destino, poda o
+        consulta a la memo) no depende del orden de exploración. Por eso basta con
+        recorrer la tabla al terminar y el camino sin instrumentar no paga nada.
+
+        Args:
+            estados: Iterable de los (x, y, t) guardados en la tabla de memoización
+            alcanzable: Predicado de poda que usó el solver
+
+        Returns:
+            Diccionario con las claves de CONTADORES_MEMO
+        """
+        n, T, bombas = self.n, self.max_steps, self.bombas
+        contadores = dict.fromkeys(CONTADORES_MEMO, 0)
+        consultas = 0
+
+        def clasificar(x: int, y: int, t: int) -> None:
+            nonlocal consultas
+            if not (0 <= x < n and 0 <= y < n) or bombas[x * n + y]:
+                contadores['rechazos_limite_bomba'] += 1
+            elif t > T:
+                contadores['rechazos_tiempo'] += 1
+            elif x == n - 1 and y == n - 1:
+                contadores['llegadas_meta'] += 1
+            elif not alcanzable(x, y, t):
+                contadores['podas_alcanzable'] += 1
+            else:
+                consultas += 1
+
+        clasificar(0, 0, 0)
+        for x, y, t in estados:
+            contadores['estados_guardados'] += 1
+            for dx, dy in self.directions:
+                clasificar(x + dx, y + dy, t + 1)
+        contadores['memo_misses'] = contadores['estados_guardados']
+        contadores['memo_hits'] = consultas - contadores['memo_misses']
+        return contadores
+
+    def _camino_sin_padres(self, memo: Any, alcanzable: Any) -> List[Tuple[int, int]]:
+        """
+        Reconstruye el camino óptimo sin tabla parent, releyendo la tabla de valores.
+
+        En cada estado del camino el mejor vecino es el primero, en el orden de
+        self.directions, cuyo valor en t+1 iguala f(x,y,t) menos el valor de la
+        celda; es el mismo desempate que la mejora estricta de la recursión. Solo
+        se examinan cuatro vecinos por paso: O(largo del camino) en total.
+
+        Args:
+            memo: memo(x, y, t) devuelve el valor memoizado de un estado que no es caso base
+            alcanzable: Criterio de poda que usó la resolución
+
+        Returns:
+            Camino desde (0,0) hasta (n-1,n-1); requiere que f(0,0,0) tenga camino
+        """
+        n, bombas, radaway = self.n, self.bombas, self.radaway
+
+        def valor(x: int, y: int, t: int) -> int:
+            # Los mismos casos base que funcion_capsulas, en el mismo orden
+            if not (0 <= x < n and 0 <= y < n) or bombas[x * n + y] or t > self.max_steps:
+                return INF_NEG
+            if x == n - 1 and y == n - 1:
+                return radaway[x * n + y]
+            if not alcanzable(x, y, t):
+                return INF_NEG
+            return memo(x, y, t)
+
+        x, y, t = 0, 0, 0
+        camino = [(x, y)]
+        while (x, y) != (n - 1, n - 1):
+            objetivo = memo(x, y, t) - radaway[x * n + y]
+            for dx, dy in self.directions:
+                if valor(x + dx, y + dy, t + 1) == objetivo:
+                    x, y, t = x + dx, y + dy, t + 1
+                    camino.append((x, y))
+                    break
+            else:
+                break
+        return camino
+
+    def resuelve_con_array(self, podar: bool = False, instrumentar: bool = False,
+                           sin_padres: bool = False) -> Tuple[int, Dict, list]:
         """
         Resuelve el problema usando un array tridimensional para memoización.
+
+        Con podar=True solo se reservan y exploran los estados de la intersección
+        calculada por preprocesar_alcanzabilidad(): dp[x][y] guarda un cupo por
+        cada t válido, indexado por (t - dist_inicio[x][y]) // 2.
+
+        Con instrumentar=True las estadísticas agregan los contadores de
+        CONTADORES_MEMO, el tiempo de resolución separado del de reconstrucción y
+        el tamaño de las tablas dp y parent (bytes_tablas).
+
+        Con sin_padres=True no se reserva la tabla parent: el camino se reconstruye
+        desde dp con _camino_sin_padres.
         """
-        dp = [[[-1 for _ in range(self.max_steps + 1)] 
-                for _ in range(self.n)] 
-                for _ in range(self.n)]
-        parent: list[list[list[Any]]] = [[[None for _ in range(self.max_steps + 1)] 
-                for _ in range(self.n)] 
-                for _ in range(self.n)]
+        infactible = self._descarte_infactible('Array 3D')
+        if infactible is not None:
+            return infactible
+        poda: Dict = {}
+        if podar:
+            inicio_prep = time.time()
+            poda = self.preprocesar_alcanzabilidad()
+            poda['tiempo_preprocesamiento'] = time.time() - inicio_prep
+            alcanzable = self.en_interseccion
+            desplazamiento: Optional[List[List[int]]] = self.dist_inicio
+            dp = [[[-1] * self.cupos_estado(x, y) for y in range(self.n)]
+                  for x in range(self.n)]
+            parent: Optional[list[list[list[Any]]]] = None if sin_padres else [
+                [[None] * self.cupos_estado(x, y) for y in range(self.n)] for x in range(self.n)]
+        else:
+            alcanzable = self.es_alcanzable
+            desplazamiento = None
+            dp = [[[-1 for _ in range(self.max_steps + 1)] 
+                    for _ in range(self.n)] 
+                    for _ in range(self.n)]
+            parent = None if sin_padres else [[[None for _ in range(self.max_steps + 1)] 
+                    for _ in range(self.n)] 
+                    for _ in range(self.n)]
+        n, bombas, radaway = self.n, self.bombas, self.radaway
         self.calls_count = 0
         # Iniciar medición de memoria
-        tracemalloc.start()
+        self._iniciar_medicion_memoria()
         start_time = time.time()
         
         def funcion_capsulas(x: int, y: int, t: int) -> int:
@@ -133,61 +560,70 @@ class alg_optimizado:
             self.calls_count += 1
             
             # Caso base: fuera de límites o celda con bomba
-            if not self.posicion_valida(x, y) or self.grid[x][y] == 'B':
-                return -999999
+            if not (0 <= x < n and 0 <= y < n) or bombas[x * n + y]:
+                return INF_NEG
             
             # Caso base: se acabó el tiempo
             if t > self.max_steps:
-                return -999999
+                return INF_NEG
             
             # Caso base: llegamos al destino
             if x == self.n - 1 and y == self.n - 1:
-                return 1 if self.grid[x][y] == 'R' else 0
+                return radaway[x * n + y]
             
             # Poda: verificar si es posible llegar al destino
-            if not self.es_alcanzable(x, y, t):
-                return -999999
+            if not alcanzable(x, y, t):
+                return INF_NEG
             
             # Verificar si ya está calculado
-            if dp[x][y][t] != -1:
-                return dp[x][y][t]
+            i = t if desplazamiento is None else (t - desplazamiento[x][y]) >> 1
+            if dp[x][y][i] != -1:
+                return dp[x][y][i]
             
             # Calcular valor de la celda actual
-            celda_actual = 1 if self.grid[x][y] == 'R' else 0
+            celda_actual = radaway[x * n + y]
             
             # Explorar todas las direcciones posibles
-            max_capsulas = -999999
+            max_capsulas = INF_NEG
             mejor_movimiento = None
             for dx, dy in self.directions:
                 nx, ny = x + dx, y + dy
                 next_capsulas = funcion_capsulas(nx, ny, t + 1)
                 if next_capsulas > max_capsulas:
                     max_capsulas = next_capsulas
-                    mejor_movimiento = (nx, ny)
+                    if parent is not None:
+                        mejor_movimiento = (nx, ny)
             
             # Memoizar resultado
-            dp[x][y][t] = celda_actual + max_capsulas if max_capsulas != -999999 else -999999
-            parent[x][y][t] = mejor_movimiento if max_capsulas != -999999 else None
-            return dp[x][y][t]
+            dp[x][y][i] = celda_actual + max_capsulas if max_capsulas != INF_NEG else INF_NEG
+            if parent is not None:
+                parent[x][y][i] = mejor_movimiento if max_capsulas != INF_NEG else None
+            return dp[x][y][i]
 
         resultado = funcion_capsulas(0, 0, 0)
 
         end_time = time.time()
-        current_memory, peak_memory = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        peak_memory = self._pico_memoria()
         
         # Reconstruir camino óptimo
+        inicio_reconstruccion = time.time()
         camino_opt = []
         x, y, t = 0, 0, 0
-        if dp[x][y][t] != -999999:
+        if resultado != INF_NEG and parent is None:
+            def memo(x: int, y: int, t: int) -> int:
+                return dp[x][y][t if desplazamiento is None else (t - desplazamiento[x][y]) >> 1]
+            camino_opt = self._camino_sin_padres(memo, alcanzable)
+        elif resultado != INF_NEG:
             camino_opt.append((x, y))
             while (x, y) != (self.n-1, self.n-1):
-                sgt_pos = parent[x][y][t]
+                i = t if desplazamiento is None else (t - desplazamiento[x][y]) >> 1
+                sgt_pos = parent[x][y][i]
                 if sgt_pos is None:
                     break
                 x, y = sgt_pos
                 camino_opt.append((x, y))
                 t += 1
+        fin_reconstruccion = time.time()
         
         stats = {
             'execution_time': end_time - start_time,
@@ -195,21 +631,159 @@ class alg_optimizado:
             'function_calls': self.calls_count,
             'method': 'Array 3D'
         }
+        stats.update(poda)
+        if sin_padres:
+            stats['tiempo_reconstruccion'] = fin_reconstruccion - inicio_reconstruccion
+        if instrumentar:
+            guardados = ((x, y, i if desplazamiento is None else desplazamiento[x][y] + 2 * i)
+                         for x in range(n) for y in range(n)
+                         for i, valor in enumerate(dp[x][y]) if valor != -1)
+            stats.update(self._contadores_memo(guardados, alcanzable))
+            stats['tiempo_resolucion'] = end_time - start_time
+            stats['tiempo_reconstruccion'] = fin_reconstruccion - inicio_reconstruccion
+            # Las tablas se reservan fuera de tracemalloc: su tamaño va aparte
+            stats['bytes_tablas'] = self.memoria_tablas_array3d(podar, sin_padres)
         
         return max(0, resultado), stats, camino_opt
     
-    def resuelve_hash(self) -> Tuple[int, Dict, list]:
+    def resuelve_compacto(self) -> Tuple[int, Dict, list]:
+        """
+        Resuelve el problema como resuelve_con_array, pero con tablas planas tipadas.
+
+        dp es un array('h') de enteros de 16 bits y parent un array('b') con el
+        índice del mejor movimiento en self.directions, ambos indexados por
+        (x*n + y)*(T+1) + t. Así cada estado ocupa 3 bytes y no se crea una
+        tupla por cada estado memoizado.
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo
+        """
+        infactible = self._descarte_infactible('Array compacto')
+        if infactible is not None:
+            return infactible
+        n = self.n
+        pasos = self.max_steps + 1
+        # En dp: -1 = no calculado, SIN_CAMINO_H = sin camino válido
+        dp = array('h', [-1]) * (n * n * pasos)
+        parent = array('b', [-1]) * (n * n * pasos)
+        movimientos = [(codigo, dx, dy) for codigo, (dx, dy) in enumerate(self.directions)]
+        bombas, radaway = self.bombas, self.radaway
+        self.calls_count = 0
+        # Iniciar medición de memoria
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        def funcion_compacta(x: int, y: int, t: int) -> int:
+            """
+            Misma recurrencia que funcion_capsulas sobre las tablas compactas.
+            """
+            self.calls_count += 1
+
+            # Caso base: fuera de límites o celda con bomba
+            if not (0 <= x < n and 0 <= y < n) or bombas[x * n + y]:
+                return INF_NEG
+
+            # Caso base: se acabó el tiempo
+            if t > self.max_steps:
+                return INF_NEG
+
+            # Caso base: llegamos al destino
+            if x == n - 1 and y == n - 1:
+                return radaway[x * n + y]
+
+            # Poda: verificar si es posible llegar al destino
+            if not self.es_alcanzable(x, y, t):
+                return INF_NEG
+
+            # Verificar si ya está calculado
+            i = (x * n + y) * pasos + t
+            guardado = dp[i]
+            if guardado != -1:
+                return guardado if guardado != SIN_CAMINO_H else INF_NEG
+
+            # Calcular valor de la celda actual
+            celda_actual = radaway[x * n + y]
+
+            # Explorar todas las direcciones posibles
+            max_capsulas = INF_NEG
+            mejor_codigo = -1
+            for codigo, dx, dy in movimientos:
+                next_capsulas = funcion_compacta(x + dx, y + dy, t + 1)
+                if next_capsulas > max_capsulas:
+                    max_capsulas = next_capsulas
+                    mejor_codigo = codigo
+
+            # Memoizar resultado
+            if max_capsulas == INF_NEG:
+                dp[i] = SIN_CAMINO_H
+                return INF_NEG
+            dp[i] = celda_actual + max_capsulas
+            parent[i] = mejor_codigo
+            return dp[i]
+
+        resultado = funcion_compacta(0, 0, 0)
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        # Reconstruir camino óptimo
+        camino_opt = []
+        x, y, t = 0, 0, 0
+        if resultado != INF_NEG:
+            camino_opt.append((x, y))
+            while (x, y) != (n - 1, n - 1):
+                codigo = parent[(x * n + y) * pasos + t]
+                if codigo < 0:
+                    break
+                dx, dy = self.directions[codigo]
+                x, y = x + dx, y + dy
+                camino_opt.append((x, y))
+                t += 1
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Array compacto',
+            'memory_tablas': dp.itemsize * len(dp) + parent.itemsize * len(parent),
+            'memory_array3d_estimada': self.memoria_tablas_array3d()
+        }
+
+        return max(0, resultado), stats, camino_opt
+
+    def resuelve_hash(self, podar: bool = False, instrumentar: bool = False,
+                      sin_padres: bool = False) -> Tuple[int, Dict, list]:
         """
         Resuelve el problema usando un diccionario hash para memoización.
+
+        Con podar=True la poda Manhattan se reemplaza por la intersección exacta
+        de preprocesar_alcanzabilidad(), por lo que solo se guardan esos estados.
+
+        Con instrumentar=True las estadísticas agregan los contadores de
+        CONTADORES_MEMO y el tiempo de resolución separado del de reconstrucción.
+
+        Con sin_padres=True no se guarda el diccionario parent: el camino se
+        reconstruye desde dp con _camino_sin_padres.
         
         Retorna máximo_cápsulas y estadísticas_rendimiento
         """
+        infactible = self._descarte_infactible('Dictionary Hash')
+        if infactible is not None:
+            return infactible
+        poda: Dict = {}
+        if podar:
+            inicio_prep = time.time()
+            poda = self.preprocesar_alcanzabilidad()
+            poda['tiempo_preprocesamiento'] = time.time() - inicio_prep
+            alcanzable = self.en_interseccion
+        else:
+            alcanzable = self.es_alcanzable
+        n, bombas, radaway = self.n, self.bombas, self.radaway
         dp = {}  # Diccionario para memoización
-        parent = {}
+        parent: Optional[Dict] = None if sin_padres else {}
         self.calls_count = 0
         
         # Iniciar medición de memoria
-        tracemalloc.start()
+        self._iniciar_medicion_memoria()
         start_time = time.time()
 
         def funcion_hash(x: int, y: int, t: int) -> int:
@@ -228,20 +802,20 @@ class alg_optimizado:
             self.calls_count += 1
             
             # Caso base: fuera de límites o celda con bomba
-            if not self.posicion_valida(x, y) or self.grid[x][y] == 'B':
-                return -999999
+            if not (0 <= x < n and 0 <= y < n) or bombas[x * n + y]:
+                return INF_NEG
             
             # Caso base: se acabó el tiempo
             if t > self.max_steps:
-                return -999999
+                return INF_NEG
             
             # Caso base: llegamos al destino
             if x == self.n - 1 and y == self.n - 1:
-                return 1 if self.grid[x][y] == 'R' else 0
+                return radaway[x * n + y]
             
             # Poda: verificar si es posible llegar al destino
-            if not self.es_alcanzable(x, y, t):
-                return -999999
+            if not alcanzable(x, y, t):
+                return INF_NEG
 
             estado = (x, y, t)
             # Verificar si ya está calculado
@@ -249,33 +823,37 @@ class alg_optimizado:
                 return dp[estado]
 
             # Calcular valor de la celda actual
-            celda_actual = 1 if self.grid[x][y] == 'R' else 0
+            celda_actual = radaway[x * n + y]
             
             # Explorar todas las direcciones posibles
-            max_capsulas = -999999
+            max_capsulas = INF_NEG
             mejor_movimiento = None
             for dx, dy in self.directions:
                 nx, ny = x + dx, y + dy
                 next_capsulas = funcion_hash(nx, ny, t + 1)
                 if next_capsulas > max_capsulas:
                     max_capsulas = next_capsulas
-                    mejor_movimiento = (nx, ny)
+                    if parent is not None:
+                        mejor_movimiento = (nx, ny)
 
             # Memoizar resultado
-            dp[estado] = celda_actual + max_capsulas if max_capsulas != -999999 else -999999
-            parent[estado] = mejor_movimiento if max_capsulas != -999999 else None
+            dp[estado] = celda_actual + max_capsulas if max_capsulas != INF_NEG else INF_NEG
+            if parent is not None:
+                parent[estado] = mejor_movimiento if max_capsulas != INF_NEG else None
             return dp[estado]
 
         resultado = funcion_hash(0, 0, 0)
 
         end_time = time.time()
-        current_memory, peak_memory = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        peak_memory = self._pico_memoria()
         
         # Reconstruir camino óptimo
+        inicio_reconstruccion = time.time()
         camino_opt = []
         x, y, t = 0, 0, 0
-        if (0, 0, 0) in dp and dp[(0, 0, 0)] != -999999:
+        if (0, 0, 0) in dp and dp[(0, 0, 0)] != INF_NEG and parent is None:
+            camino_opt = self._camino_sin_padres(lambda x, y, t: dp.get((x, y, t), INF_NEG), alcanzable)
+        elif (0, 0, 0) in dp and dp[(0, 0, 0)] != INF_NEG:
             camino_opt.append((x, y))
             while (x, y) != (self.n-1, self.n-1):
                 pos_sgt = parent.get((x, y, t))
@@ -284,6 +862,7 @@ class alg_optimizado:
                 x, y = pos_sgt
                 camino_opt.append((x, y))
                 t += 1
+        fin_reconstruccion = time.time()
         
         stats = {
             'execution_time': end_time - start_time,
@@ -291,85 +870,1671 @@ class alg_optimizado:
             'function_calls': self.calls_count,
             'method': 'Dictionary Hash'
         }
+        stats.update(poda)
+        if sin_padres:
+            stats['tiempo_reconstruccion'] = fin_reconstruccion - inicio_reconstruccion
+        if instrumentar:
+            stats.update(self._contadores_memo(dp.keys(), alcanzable))
+            stats['tiempo_resolucion'] = end_time - start_time
+            stats['tiempo_reconstruccion'] = fin_reconstruccion - inicio_reconstruccion
         
         return max(0, resultado), stats, camino_opt
 
+    def resuelve_hash_empaquetado(self, por_capas: bool = False,
+                                  instrumentar: bool = False) -> Tuple[int, Dict, list]:
+        """
+        Resuelve con la misma recursión memoizada de resuelve_hash, sin tuplas.
 
-def graficos_comparativos(todos_resultados: List[Dict]) -> None:
-    """
-    Crea gráficos comparativos de rendimiento entre Array 3D y Dictionary Hash.
-    
-    Args:
-        todos_resultados: Lista de resultados de experimentos
-    """
-    if len(todos_resultados) < 2:
-        print("Se necesitan al menos 2 experimentos para generar gráficos comparativos.")
-        return
+        El estado (x,y,t) se codifica como un solo entero (t*n + x)*n + y y el
+        padre se guarda como índice en self.directions, así que cada estado nuevo
+        solo inserta dos enteros. Con por_capas=True hay un diccionario por paso t
+        (la clave es x*n + y): las tablas de valores se sueltan apenas termina la
+        recursión y las de padres a medida que la reconstrucción las recorre.
 
-    sizes = [result['size'] for result in todos_resultados]
-    array_times = [result['array_avg_time'] for result in todos_resultados]
-    dict_times = [result['dict_avg_time'] for result in todos_resultados]
-    array_memory = [result['array_avg_memory'] for result in todos_resultados]
-    dict_memory = [result['dict_avg_memory'] for result in todos_resultados]
-    array_calls = [result['array_avg_calls'] for result in todos_resultados]
-    dict_calls = [result['dict_avg_calls'] for result in todos_resultados]
+        Con instrumentar=True las estadísticas agregan los contadores de
+        CONTADORES_MEMO y el tiempo de resolución separado del de reconstrucción.
 
-    # Crear subplots
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
-    fig.suptitle('Comparación de Rendimiento: Array 3D vs Dictionary Hash', fontsize=16, fontweight='bold')
-    
-    # Gráfico 1: Tiempo de ejecución
-    ax1.plot(sizes, array_times, 'b-o', label='Array 3D', linewidth=2, markersize=8)
-    ax1.plot(sizes, dict_times, 'r-s', label='Dictionary Hash', linewidth=2, markersize=8)
-    ax1.set_xlabel('Tamaño del mapa (n)', fontsize=12)
-    ax1.set_ylabel('Tiempo promedio (segundos)', fontsize=12)
-    ax1.set_title('Tiempo de Ejecución', fontsize=14, fontweight='bold')
-    ax1.legend(fontsize=11)
-    ax1.grid(True, alpha=0.3)
-    ax1.set_yscale('log')
-    
-    # Gráfico 2: Uso de memoria
-    x_pos = np.arange(len(sizes))
-    width = 0.35
-    ax2.bar(x_pos - width/2, array_memory, width, label='Array 3D', alpha=0.8, color='blue')
-    ax2.bar(x_pos + width/2, dict_memory, width, label='Dictionary Hash', alpha=0.8, color='red')
-    ax2.set_xlabel('Tamaño del mapa (n)', fontsize=12)
-    ax2.set_ylabel('Memoria promedio (KB)', fontsize=12)
-    ax2.set_title('Uso de Memoria', fontsize=14, fontweight='bold')
-    ax2.set_xticks(x_pos)
-    ax2.set_xticklabels(sizes)
-    ax2.legend(fontsize=11)
-    ax2.grid(True, alpha=0.3)
-    
-    # Gráfico 3: Factor de velocidad (speedup)
-    speedup_factors = [a/d if d > 0 else 1 for a, d in zip(array_times, dict_times)]
-    colors = ['green' if s < 1 else 'orange' if s < 1.5 else 'red' for s in speedup_factors]
-    ax3.bar(sizes, speedup_factors, color=colors, alpha=0.7)
-    ax3.axhline(y=1, color='black', linestyle='--', alpha=0.7, label='Mismo rendimiento')
-    ax3.set_xlabel('Tamaño del mapa (n)', fontsize=12)
-    ax3.set_ylabel('Factor de velocidad (Array/Dict)', fontsize=12)
-    ax3.set_title('Factor de Velocidad Relativa', fontsize=14, fontweight='bold')
-    ax3.legend(fontsize=11)
-    ax3.grid(True, alpha=0.3)
-    
-    # Gráfico 4: Número de llamadas recursivas
-    ax4.semilogy(sizes, array_calls, 'b-o', label='Array 3D', linewidth=2, markersize=8)
-    ax4.semilogy(sizes, dict_calls, 'r-s', label='Dictionary Hash', linewidth=2, markersize=8)
-    ax4.set_xlabel('Tamaño del mapa (n)', fontsize=12)
-    ax4.set_ylabel('Llamadas promedio (escala log)', fontsize=12)
-    ax4.set_title('Número de Llamadas Recursivas', fontsize=14, fontweight='bold')
-    ax4.legend(fontsize=11)
-    ax4.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.show()
-    
-    # Mostrar análisis textual
-    print(f"\n{'='*80}")
-    print("ANÁLISIS COMPARATIVO DE RENDIMIENTO")
-    print(f"{'='*80}")
-    
-    for i, size in enumerate(sizes):
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo
+        """
+        nombre_metodo = 'Hash por capas' if por_capas else 'Hash empaquetado'
+        infactible = self._descarte_infactible(nombre_metodo)
+        if infactible is not None:
+            return infactible
+        alcanzable = self.es_alcanzable
+        n, T, bombas, radaway = self.n, self.max_steps, self.bombas, self.radaway
+        nn = n * n
+        # tablas[t] y padres[t] son el diccionario del paso t; en modo plano todos
+        # apuntan al mismo y desplazamiento[t] = t*n*n completa la clave
+        if por_capas:
+            tablas: List[Optional[Dict[int, int]]] = [{} for _ in range(T + 1)]
+            padres: List[Optional[Dict[int, int]]] = [{} for _ in range(T + 1)]
+            desplazamiento: List[int] = []
+        else:
+            dp: Dict[int, int] = {}
+            parent: Dict[int, int] = {}
+            tablas = [dp] * (T + 1)
+            padres = [parent] * (T + 1)
+            desplazamiento = [t * nn for t in range(T + 1)]
+        direcciones = list(enumerate(self.directions))
+        meta = nn - 1
+        self.calls_count = 0
+
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        def funcion_empaquetada(x: int, y: int, t: int) -> int:
+            """
+            Igual que funcion_hash, con la clave entera del estado.
+
+            Returns:
+                Máximo número de cápsulas recolectables desde esta posición
+            """
+            self.calls_count += 1
+
+            # Caso base: fuera de límites o celda con bomba (el índice plano se
+            # calcula una sola vez: cada entero grande es una asignación)
+            if not (0 <= x < n and 0 <= y < n):
+                return INF_NEG
+            celda = x * n + y
+            if bombas[celda]:
+                return INF_NEG
+
+            # Caso base: se acabó el tiempo
+            if t > T:
+                return INF_NEG
+
+            # Caso base: llegamos al destino
+            if celda == meta:
+                return radaway[celda]
+
+            # Poda: verificar si es posible llegar al destino
+            if not alcanzable(x, y, t):
+                return INF_NEG
+
+            tabla = tablas[t]
+            clave = celda + desplazamiento[t] if desplazamiento else celda
+            valor = tabla.get(clave)
+            if valor is not None:
+                return valor
+
+            max_capsulas = INF_NEG
+            mejor_codigo = -1
+            for codigo, (dx, dy) in direcciones:
+                next_capsulas = funcion_empaquetada(x + dx, y + dy, t + 1)
+                if next_capsulas > max_capsulas:
+                    max_capsulas = next_capsulas
+                    mejor_codigo = codigo
+
+            if max_capsulas == INF_NEG:
+                tabla[clave] = INF_NEG
+                return INF_NEG
+            valor = radaway[celda] + max_capsulas
+            tabla[clave] = valor
+            padres[t][clave] = mejor_codigo
+            return valor
+
+        resultado = funcion_empaquetada(0, 0, 0)
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        guardados = None
+        if instrumentar:
+            if por_capas:
+                guardados = [(clave // n, clave % n, t) for t, tabla in enumerate(tablas) for clave in tabla]
+            else:
+                guardados = [((clave % nn) // n, clave % n, clave // nn) for clave in dp]
+        max_estados_capa = max(map(len, tablas)) if por_capas else None
+        if por_capas:
+            tablas[:] = [None] * len(tablas)
+
+        # Reconstruir camino óptimo siguiendo los códigos de dirección
+        inicio_reconstruccion = time.time()
+        camino_opt = []
+        x, y, t = 0, 0, 0
+        if resultado != INF_NEG:
+            camino_opt.append((x, y))
+            while (x, y) != (n - 1, n - 1):
+                codigo = padres[t].get(x * n + y + (desplazamiento[t] if desplazamiento else 0))
+                if por_capas:
+                    padres[t] = None
+                if codigo is None:
+                    break
+                dx, dy = self.directions[codigo]
+                x, y = x + dx, y + dy
+                camino_opt.append((x, y))
+                t += 1
+        fin_reconstruccion = time.time()
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': nombre_metodo
+        }
+        if por_capas:
+            stats['max_estados_capa'] = max_estados_capa
+        if instrumentar:
+            stats.update(self._contadores_memo(guardados, alcanzable))
+            stats['tiempo_resolucion'] = end_time - start_time
+            stats['tiempo_reconstruccion'] = fin_reconstruccion - inicio_reconstruccion
+
+        return max(0, resultado), stats, camino_opt
+
+    def resuelve_pila(self, podar: bool = False, instrumentar: bool = False,
+                      sin_padres: bool = False) -> Tuple[int, Dict, list]:
+        """
+        Resuelve con la misma exploración top-down memoizada de resuelve_hash, pero
+        con una pila explícita en lugar de recursión.
+
+        Cada marco de la pila guarda el estado, la siguiente dirección por explorar
+        y el mejor valor visto; al agotar las cuatro direcciones se memoiza y el valor
+        se entrega al marco de abajo. Solo se visitan los estados que se demandan,
+        la profundidad no depende de sys.getrecursionlimit() y function_calls cuenta
+        las mismas evaluaciones que las llamadas de funcion_hash. instrumentar y
+        sin_padres funcionan igual que en resuelve_hash.
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo
+        """
+        infactible = self._descarte_infactible('Pila Explícita')
+        if infactible is not None:
+            return infactible
+        poda: Dict = {}
+        if podar:
+            inicio_prep = time.time()
+            poda = self.preprocesar_alcanzabilidad()
+            poda['tiempo_preprocesamiento'] = time.time() - inicio_prep
+            alcanzable = self.en_interseccion
+        else:
+            alcanzable = self.es_alcanzable
+        n, bombas, radaway = self.n, self.bombas, self.radaway
+        T = self.max_steps
+        meta = n - 1
+        directions = self.directions
+        dp = {}
+        parent: Optional[Dict] = None if sin_padres else {}
+
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        def evaluar(x: int, y: int, t: int) -> Optional[int]:
+            """Valor de (x,y,t) si es un caso base o ya está memoizado; None si hay que expandirlo."""
+            if not (0 <= x < n and 0 <= y < n) or bombas[x * n + y]:
+                return INF_NEG
+            if t > T:
+                return INF_NEG
+            if x == meta and y == meta:
+                return radaway[x * n + y]
+            if not alcanzable(x, y, t):
+                return INF_NEG
+            return dp.get((x, y, t))
+
+        llamadas = 1
+        resultado = evaluar(0, 0, 0)
+        # La pila son listas paralelas preasignadas (la profundidad nunca pasa de
+        # max_steps+1), así que apilar un marco no reserva memoria nueva. Por marco:
+        # estado, siguiente dirección por explorar, máximo de cápsulas y mejor dirección.
+        profundidad = T + 2
+        pila_x, pila_y, pila_t = [0] * profundidad, [0] * profundidad, [0] * profundidad
+        pila_dir, pila_max, pila_mejor = [0] * profundidad, [INF_NEG] * profundidad, [-1] * profundidad
+        tope = 0 if resultado is None else -1
+        while tope >= 0:
+            x, y, t = pila_x[tope], pila_y[tope], pila_t[tope]
+            d = pila_dir[tope]
+            if d < 4:
+                pila_dir[tope] = d + 1
+                dx, dy = directions[d]
+                nx, ny = x + dx, y + dy
+                llamadas += 1
+                # Mismo orden de casos base que funcion_hash, en línea para evitar
+                # una llamada por vecino
+                if not (0 <= nx < n and 0 <= ny < n) or bombas[nx * n + ny] or t >= T:
+                    valor = INF_NEG
+                elif nx == meta and ny == meta:
+                    valor = radaway[nx * n + ny]
+                elif not alcanzable(nx, ny, t + 1):
+                    valor = INF_NEG
+                else:
+                    valor = dp.get((nx, ny, t + 1))
+                if valor is None:
+                    tope += 1
+                    pila_x[tope], pila_y[tope], pila_t[tope] = nx, ny, t + 1
+                    pila_dir[tope], pila_max[tope], pila_mejor[tope] = 0, INF_NEG, -1
+                elif valor > pila_max[tope]:
+                    pila_max[tope] = valor
+                    pila_mejor[tope] = d
+                continue
+
+            # Se exploraron las cuatro direcciones: memoizar y devolver al marco de abajo
+            max_capsulas = pila_max[tope]
+            if max_capsulas != INF_NEG:
+                valor = radaway[x * n + y] + max_capsulas
+                if parent is not None:
+                    dx, dy = directions[pila_mejor[tope]]
+                    parent[(x, y, t)] = (x + dx, y + dy)
+            else:
+                valor = INF_NEG
+                if parent is not None:
+                    parent[(x, y, t)] = None
+            dp[(x, y, t)] = valor
+            tope -= 1
+            if tope >= 0:
+                if valor > pila_max[tope]:
+                    pila_max[tope] = valor
+                    # La dirección que llevó a este marco es la última que se avanzó
+                    pila_mejor[tope] = pila_dir[tope] - 1
+            else:
+                resultado = valor
+        self.calls_count = llamadas
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        # Reconstruir camino óptimo
+        inicio_reconstruccion = time.time()
+        camino_opt = []
+        x, y, t = 0, 0, 0
+        if (0, 0, 0) in dp and dp[(0, 0, 0)] != INF_NEG and parent is None:
+            camino_opt = self._camino_sin_padres(lambda x, y, t: dp.get((x, y, t), INF_NEG), alcanzable)
+        elif (0, 0, 0) in dp and dp[(0, 0, 0)] != INF_NEG:
+            camino_opt.append((x, y))
+            while (x, y) != (meta, meta):
+                pos_sgt = parent.get((x, y, t))
+                if pos_sgt is None:
+                    break
+                x, y = pos_sgt
+                camino_opt.append((x, y))
+                t += 1
+        fin_reconstruccion = time.time()
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Pila Explícita'
+        }
+        stats.update(poda)
+        if sin_padres:
+            stats['tiempo_reconstruccion'] = fin_reconstruccion - inicio_reconstruccion
+        if instrumentar:
+            stats.update(self._contadores_memo(dp.keys(), alcanzable))
+            stats['tiempo_resolucion'] = end_time - start_time
+            stats['tiempo_reconstruccion'] = fin_reconstruccion - inicio_reconstruccion
+
+        return max(0, resultado), stats, camino_opt
+
+    def resuelve_frontera(self) -> Tuple[int, Dict, list]:
+        """
+        Resuelve con programación dinámica hacia adelante sobre la frontera activa.
+
+        En lugar de reservar los n·n·(2n) estados, avanza desde (0,0) una capa de pasos
+        a la vez guardando solo las celdas vivas de cada capa: un diccionario
+        celda -> cápsulas recogidas hasta ella y otro celda -> celda anterior. Las celdas
+        que no pasan es_alcanzable se descartan y los duplicados se fusionan quedándose
+        con el mejor valor, así que tiempo y memoria crecen con los estados alcanzables.
+
+        La respuesta es la misma que la de resuelve_con_array; entre caminos empatados
+        puede elegir otro, porque el desempate se hace al avanzar y no al retroceder.
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo
+        """
+        infactible = self._descarte_infactible('Frontera Dispersa')
+        if infactible is not None:
+            return infactible
+        n, bombas, radaway = self.n, self.bombas, self.radaway
+        T = self.max_steps
+        meta = n * n - 1
+        # Desplazamientos de self.directions sobre el índice plano x*n+y
+        desplazamientos = [dx * n + dy for dx, dy in self.directions]
+
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        resultado, t_meta = INF_NEG, -1
+        capas_padre: List[Dict[int, int]] = []
+        estados = 0
+        if not bombas[0] and self.es_alcanzable(0, 0, 0):
+            frontera = {0: radaway[0]}
+            capas_padre.append({0: -1})
+            estados = 1
+            if meta == 0:
+                resultado, t_meta = radaway[0], 0
+                frontera = {}
+            for t in range(T):
+                if not frontera:
+                    break
+                # es_alcanzable(x, y, t+1) <=> dist_meta(x, y) <= T - t - 1
+                restantes = T - t - 1
+                siguiente: Dict[int, int] = {}
+                padres: Dict[int, int] = {}
+                for c, valor in frontera.items():
+                    x, y = divmod(c, n)
+                    for i, (dx, dy) in enumerate(self.directions):
+                        nx, ny = x + dx, y + dy
+                        if not (0 <= nx < n and 0 <= ny < n):
+                            continue
+                        nc = c + desplazamientos[i]
+                        if bombas[nc] or (n - 1 - nx) + (n - 1 - ny) > restantes:
+                            continue
+                        candidato = valor + radaway[nc]
+                        if candidato > siguiente.get(nc, INF_NEG):
+                            siguiente[nc] = candidato
+                            padres[nc] = c
+                capas_padre.append(padres)
+                estados += len(siguiente)
+                # Caso base: el destino termina el camino
+                if meta in siguiente:
+                    if siguiente[meta] > resultado:
+                        resultado, t_meta = siguiente[meta], t + 1
+                    del siguiente[meta]
+                frontera = siguiente
+        self.calls_count = estados
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        # Reconstruir camino óptimo siguiendo los padres desde la capa en que se llegó
+        camino_opt = []
+        if resultado != INF_NEG:
+            c = meta
+            for t in range(t_meta, -1, -1):
+                camino_opt.append(divmod(c, n))
+                c = capas_padre[t][c]
+            camino_opt.reverse()
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Frontera Dispersa',
+            'estados_frontera': estados
+        }
+
+        return max(0, resultado), stats, camino_opt
+
+    def densidad_bombas(self) -> float:
+        """Fracción de celdas de la cuadrícula que tienen bomba."""
+        return int(np.count_nonzero(self.celdas == CELDA_BOMBA)) / (self.n * self.n)
+
+    def resuelve_auto(self) -> Tuple[int, Dict, list]:
+        """
+        Elige entre la frontera dispersa y el motor vectorizado denso según la densidad
+        de bombas medida en la cuadrícula (ver UMBRAL_FRONTERA_DISPERSA).
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo del método
+        elegido, con 'densidad_bombas' y 'metodo_elegido' agregados a las estadísticas
+        """
+        densidad = self.densidad_bombas()
+        if densidad >= UMBRAL_FRONTERA_DISPERSA:
+            resultado, stats, camino_opt = self.resuelve_frontera()
+        else:
+            resultado, stats, camino_opt = self.resuelve_vectorizado()
+        stats['densidad_bombas'] = densidad
+        stats['metodo_elegido'] = stats['method']
+        stats['method'] = 'Automático'
+        return resultado, stats, camino_opt
+
+    def _planos_celdas(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convierte la cuadrícula en planos NumPy para los métodos vectorizados.
+
+        Returns:
+            Máscara de bombas, valor de cada celda (1 si hay RadAway) y
+            distancia Manhattan de cada celda al destino
+        """
+        n = self.n
+        bombas = self.celdas == CELDA_BOMBA
+        valor_celda = (self.celdas == CELDA_RADAWAY).astype(np.int32)
+        filas, columnas = np.indices((n, n))
+        distancia_meta = (n - 1 - filas) + (n - 1 - columnas)
+        return bombas, valor_celda, distancia_meta
+
+    def _capa_anterior(self, capa_sgt: np.ndarray, t: int,
+                       planos: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                       relleno: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula la capa f(·,·,t) a partir de la capa f(·,·,t+1).
+
+        Las dos últimas dimensiones de los arreglos son (x, y); las anteriores,
+        si existen, son un lote de cuadrículas del mismo n (ver resolver_lote).
+
+        Args:
+            capa_sgt: Valores de la capa t+1
+            t: Paso de la capa a calcular
+            planos: Resultado de _planos_celdas()
+            relleno: Búfer (..., n+2, n+2) reutilizable cuyo borde vale INF_NEG
+
+        Returns:
+            Valores de la capa t y, por celda, el índice en self.directions del
+            mejor movimiento (-1 si no hay movimiento válido)
+        """
+        n = self.n
+        relleno[..., 1:-1, 1:-1] = capa_sgt
+        return self._capa_ventana(relleno, self.max_steps - t, planos, 0, n, 0, n)
+
+    def _capa_ventana(self, relleno: np.ndarray, restantes: int,
+                      planos: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                      x0: int, x1: int, y0: int, y1: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula f(x,y,t) solo para la ventana x0 <= x < x1, y0 <= y < y1.
+
+        El valor de un estado solo depende de los pasos que le quedan
+        (max_steps - t), no de t ni de max_steps por separado; por eso la capa
+        se identifica por sus pasos restantes (ver resuelve_todos_presupuestos).
+
+        Args:
+            relleno: Capa siguiente completa con un borde de INF_NEG, forma (..., n+2, n+2)
+            restantes: Pasos que quedan en la capa a calcular (max_steps - t)
+            planos: Resultado de _planos_celdas()
+            x0, x1, y0, y1: Límites de la ventana (x1 e y1 excluidos)
+
+        Returns:
+            Valores y mejores movimientos de la ventana, como en _capa_anterior
+        """
+        n = self.n
+        bombas, valor_celda, distancia_meta = planos
+
+        # Planos vecinos desplazados; el borde de relleno representa fuera de límites.
+        # Se recorren en el orden de self.directions y solo una mejora estricta
+        # cambia la dirección, igual que el desempate de los métodos recursivos.
+        max_capsulas = None
+        for codigo, (dx, dy) in enumerate(self.directions):
+            plano = relleno[..., 1 + dx + x0:1 + dx + x1, 1 + dy + y0:1 + dy + y1]
+            if max_capsulas is None:
+                max_capsulas = plano.copy()
+                mejor_dir = np.zeros(plano.shape, dtype=np.int8)
+            else:
+                mejora = plano > max_capsulas
+                np.copyto(max_capsulas, plano, where=mejora)
+                mejor_dir[mejora] = codigo
+
+        sin_camino = max_capsulas == INF_NEG
+        capa = max_capsulas + valor_celda[..., x0:x1, y0:y1]
+        # Poda: estados desde los que no se alcanza el destino a tiempo
+        sin_camino |= distancia_meta[x0:x1, y0:y1] > restantes
+        # Caso base: celda con bomba
+        sin_camino |= bombas[..., x0:x1, y0:y1]
+        capa[sin_camino] = INF_NEG
+        mejor_dir[sin_camino] = -1
+
+        # Caso base: llegamos al destino (salvo que haya una bomba en él)
+        if x0 <= n - 1 < x1 and y0 <= n - 1 < y1:
+            gx, gy = n - 1 - x0, n - 1 - y0
+            capa[..., gx, gy] = np.where(bombas[..., n - 1, n - 1], INF_NEG,
+                                         valor_celda[..., n - 1, n - 1])
+            mejor_dir[..., gx, gy] = -1
+
+        return capa, mejor_dir
+
+    def resuelve_vectorizado(self) -> Tuple[int, Dict, list]:
+        """
+        Resuelve el problema con programación dinámica bottom-up vectorizada con NumPy.
+
+        Calcula la misma recurrencia que funcion_capsulas, pero recorriendo t hacia atrás
+        (de max_steps a 0). Cada capa f(·,·,t) se obtiene con un único máximo vectorizado
+        sobre los cuatro planos vecinos desplazados de la capa t+1, enmascarando bombas,
+        celdas fuera de límites y estados inalcanzables.
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo
+        """
+        infactible = self._descarte_infactible('Vectorizado NumPy')
+        if infactible is not None:
+            return infactible
+        n = self.n
+        T = self.max_steps
+        self.calls_count = 0
+
+        # Iniciar medición de memoria
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        planos = self._planos_celdas()
+
+        # parent[t, x, y] guarda el índice en self.directions del mejor movimiento (-1 si no hay)
+        parent = np.full((T + 1, n, n), -1, dtype=np.int8)
+
+        # Capa t = max_steps + 1: se acabó el tiempo en todas las celdas
+        capa_sgt = np.full((n, n), INF_NEG, dtype=np.int32)
+        relleno = np.full((n + 2, n + 2), INF_NEG, dtype=np.int32)
+        for t in range(T, -1, -1):
+            capa_sgt, parent[t] = self._capa_anterior(capa_sgt, t, planos, relleno)
+            self.calls_count += n * n
+
+        resultado = int(capa_sgt[0, 0])
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        # Reconstruir camino óptimo
+        camino_opt = []
+        x, y, t = 0, 0, 0
+        if resultado != INF_NEG:
+            camino_opt.append((x, y))
+            while (x, y) != (n - 1, n - 1):
+                codigo = parent[t, x, y]
+                if codigo < 0:
+                    break
+                dx, dy = self.directions[codigo]
+                x, y = x + dx, y + dy
+                camino_opt.append((x, y))
+                t += 1
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Vectorizado NumPy'
+        }
+
+        return max(0, resultado), stats, camino_opt
+
+    def resuelve_conteo(self, guardar_tabla: bool = False) -> Tuple[int, Dict, list]:
+        """
+        Resuelve con el motor vectorizado y, en la misma pasada hacia atrás, cuenta
+        cuántos caminos óptimos salen de cada estado.
+
+        conteo(x,y,t) es la suma de conteo(vecino, t+1) sobre los vecinos cuyo valor
+        iguala al máximo (1 en el destino, 0 sin camino). Los conteos crecen como
+        coeficientes binomiales: se llevan en int64 mientras la suma de cuatro
+        vecinos no pueda desbordarse y desde ahí en enteros de Python (dtype object).
+
+        Args:
+            guardar_tabla: Si es True, deja en self.tabla_conteos la tabla completa
+                (max_steps+1, n, n); si no, solo se conservan dos capas a la vez
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento (con 'caminos_optimos') y
+        el mismo camino óptimo que resuelve_vectorizado
+        """
+        infactible = self._descarte_infactible('Conteo de Óptimos', caminos_optimos=0)
+        if infactible is not None:
+            return infactible
+        n = self.n
+        T = self.max_steps
+        self.calls_count = 0
+
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        planos = self._planos_celdas()
+        valor_celda = planos[1]
+        parent = np.full((T + 1, n, n), -1, dtype=np.int8)
+        tabla = np.empty((T + 1, n, n), dtype=object) if guardar_tabla else None
+
+        capa_sgt = np.full((n, n), INF_NEG, dtype=np.int32)
+        relleno = np.full((n + 2, n + 2), INF_NEG, dtype=np.int32)
+        # Conteos con el mismo borde que relleno: fuera de límites no aporta caminos
+        relleno_conteo = np.zeros((n + 2, n + 2), dtype=np.int64)
+        for t in range(T, -1, -1):
+            capa, parent[t] = self._capa_anterior(capa_sgt, t, planos, relleno)
+            max_sgt = capa - valor_celda
+            conteo = np.zeros((n, n), dtype=relleno_conteo.dtype)
+            for dx, dy in self.directions:
+                plano = relleno[1 + dx:1 + dx + n, 1 + dy:1 + dy + n]
+                conteo += np.where(plano == max_sgt, relleno_conteo[1 + dx:1 + dx + n, 1 + dy:1 + dy + n], 0)
+            conteo[capa == INF_NEG] = 0
+            if capa[n - 1, n - 1] != INF_NEG:
+                conteo[n - 1, n - 1] = 1
+            if relleno_conteo.dtype != object and conteo.max() >= LIMITE_CONTEO_INT64:
+                relleno_conteo = relleno_conteo.astype(object)
+            relleno_conteo[1:-1, 1:-1] = conteo
+            if tabla is not None:
+                tabla[t] = conteo
+            capa_sgt = capa
+            self.calls_count += n * n
+
+        resultado = int(capa_sgt[0, 0])
+        caminos_optimos = int(relleno_conteo[1, 1])
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        camino_opt = []
+        x, y, t = 0, 0, 0
+        if resultado != INF_NEG:
+            camino_opt.append((x, y))
+            while (x, y) != (n - 1, n - 1):
+                codigo = parent[t, x, y]
+                if codigo < 0:
+                    break
+                dx, dy = self.directions[codigo]
+                x, y = x + dx, y + dy
+                camino_opt.append((x, y))
+                t += 1
+
+        if tabla is not None:
+            self.tabla_conteos = tabla
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Conteo de Óptimos',
+            'caminos_optimos': caminos_optimos
+        }
+
+        return max(0, resultado), stats, camino_opt
+
+    def memoria_tablas_array3d(self, podar: bool = False, sin_padres: bool = False) -> int:
+        """
+        Calcula los bytes de las tablas dp y parent de resuelve_con_array sin reservarlas.
+
+        Las tablas se reservan antes de iniciar tracemalloc, por lo que su costo
+        no aparece en el memory_peak de ese método; este tamaño es la referencia
+        con la que se comparan resuelve_bajo_memoria, resuelve_compacto y la
+        variante sin padres.
+
+        Cuenta las listas anidadas tal como las arma resuelve_con_array y una tupla
+        (nx, ny) por cada estado que la recursión guarda con camino válido: los de
+        la intersección de preprocesar_alcanzabilidad() salvo el destino, que no se
+        memoiza. Los enteros pequeños y None son compartidos y no suman.
+
+        Args:
+            podar: Tablas de resuelve_con_array(podar=True), un cupo por t válido
+            sin_padres: Solo dp, como en resuelve_con_array(sin_padres=True)
+
+        Returns:
+            Bytes de ambas tablas (solo de dp con sin_padres=True)
+        """
+        n = self.n
+        self.preprocesar_alcanzabilidad()
+        cupos = [self.cupos_estado(x, y) for x in range(n) for y in range(n)]
+        if podar:
+            por_celda = sum(sys.getsizeof([None] * c) for c in cupos)
+        else:
+            por_celda = n * n * sys.getsizeof([None for _ in range(self.max_steps + 1)])
+        por_tabla = por_celda + (n + 1) * sys.getsizeof([None for _ in range(n)])
+        if sin_padres:
+            return por_tabla
+        tuplas = sum(cupos) - cupos[-1]
+        return 2 * por_tabla + tuplas * sys.getsizeof((0, 0))
+
+    def _mejor_movimiento(self, capa_sgt: np.ndarray, x: int, y: int) -> int:
+        """
+        Elige el mejor movimiento desde (x,y) mirando solo los valores de la capa t+1.
+
+        Usa el mismo desempate que los métodos recursivos: gana la primera
+        dirección de self.directions con el valor estrictamente mayor.
+
+        Returns:
+            Índice en self.directions del mejor movimiento, o -1 si no hay ninguno
+        """
+        mejor_valor, codigo = INF_NEG, -1
+        for i, (dx, dy) in enumerate(self.directions):
+            nx, ny = x + dx, y + dy
+            if self.posicion_valida(nx, ny) and capa_sgt[nx, ny] > mejor_valor:
+                mejor_valor, codigo = capa_sgt[nx, ny], i
+        return codigo
+
+    def resuelve_bajo_memoria(self, checkpoint_cada: Optional[int] = None) -> Tuple[int, Dict, list]:
+        """
+        Resuelve el problema guardando solo dos capas de valores a la vez.
+
+        La pasada hacia atrás mantiene la capa t+1 y la capa t, y guarda una copia
+        (checkpoint) cada `checkpoint_cada` pasos. Para reconstruir el camino se
+        recorre t hacia adelante por segmentos: las capas de cada segmento se
+        recalculan desde su checkpoint y se descartan al terminar el segmento.
+        La memoria pasa de O(n³) a O(n² · (T/k + k)), con k = checkpoint_cada.
+
+        Args:
+            checkpoint_cada: Separación entre capas guardadas (por defecto ≈ √(2n))
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo
+        """
+        infactible = self._descarte_infactible('Bajo memoria')
+        if infactible is not None:
+            return infactible
+        n = self.n
+        T = self.max_steps
+        k = checkpoint_cada or max(1, int(round((T + 1) ** 0.5)))
+        self.calls_count = 0
+
+        # Iniciar medición de memoria
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        planos = self._planos_celdas()
+        relleno = np.full((n + 2, n + 2), INF_NEG, dtype=np.int32)
+        fuera_de_tiempo = np.full((n, n), INF_NEG, dtype=np.int32)
+
+        # Pasada hacia atrás con capas rodantes; checkpoints en t múltiplo de k
+        checkpoints = {T + 1: fuera_de_tiempo}
+        capa_sgt = fuera_de_tiempo
+        for t in range(T, -1, -1):
+            capa_sgt, _ = self._capa_anterior(capa_sgt, t, planos, relleno)
+            self.calls_count += n * n
+            if t % k == 0:
+                checkpoints[t] = capa_sgt
+
+        resultado = int(capa_sgt[0, 0])
+
+        # Reconstruir camino óptimo segmento a segmento
+        camino_opt = []
+        if resultado != INF_NEG:
+            camino_opt = self._camino_desde_checkpoints(checkpoints, k, planos, relleno)
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        memoria_array3d = self.memoria_tablas_array3d()
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Bajo memoria',
+            'checkpoints': len(checkpoints),
+            'memory_array3d_estimada': memoria_array3d,
+            'memory_ratio_array3d': peak_memory / memoria_array3d
+        }
+
+        return max(0, resultado), stats, camino_opt
+
+    def _camino_desde_checkpoints(self, checkpoints: Dict[int, np.ndarray], k: int,
+                                  planos: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                                  relleno: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Reconstruye el camino óptimo recorriendo t hacia adelante por segmentos de k
+        pasos: las capas de cada segmento se recalculan desde el checkpoint siguiente
+        (checkpoints[t] para t múltiplo de k y para max_steps+1) y se descartan al
+        terminar el segmento.
+        """
+        n = self.n
+        T = self.max_steps
+        camino_opt = [(0, 0)]
+        x, y, t = 0, 0, 0
+        capas: Dict[int, np.ndarray] = {}
+        while (x, y) != (n - 1, n - 1):
+            if t % k == 0:
+                # Recalcular las capas t+1 .. fin del segmento desde el checkpoint siguiente
+                fin = min(t + k, T + 1)
+                capas = {fin: checkpoints[fin]}
+                for ts in range(fin - 1, t, -1):
+                    capas[ts], _ = self._capa_anterior(capas[ts + 1], ts, planos, relleno)
+                    self.calls_count += n * n
+            codigo = self._mejor_movimiento(capas[t + 1], x, y)
+            if codigo < 0:
+                break
+            dx, dy = self.directions[codigo]
+            x, y = x + dx, y + dy
+            camino_opt.append((x, y))
+            t += 1
+        return camino_opt
+
+    def resuelve_paralelo(self, num_procesos: Optional[int] = None,
+                          checkpoint_cada: Optional[int] = None) -> Tuple[int, Dict, list]:
+        """
+        Resuelve una sola cuadrícula grande repartiendo cada capa entre varios procesos.
+
+        Dentro de una capa t cada f(x,y,t) depende solo de la capa t+1, así que la
+        capa se divide en bandas de filas, una por proceso (_trabajador_frente). Las
+        dos capas rodantes, los checkpoints y la cuadrícula viven en un bloque de
+        multiprocessing.shared_memory, y una Barrier separa una capa de la siguiente.
+        El camino se reconstruye en este proceso desde los checkpoints, como en
+        resuelve_bajo_memoria.
+
+        Args:
+            num_procesos: Procesos trabajadores (por defecto, uno por núcleo, sin pasar de n)
+            checkpoint_cada: Separación entre capas guardadas (por defecto ≈ √(2n))
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo
+        """
+        infactible = self._descarte_infactible('Paralelo por Bandas', procesos=0, tiempo_frente=0.0,
+                                               tiempo_camino=0.0, memoria_compartida=0)
+        if infactible is not None:
+            return infactible
+        n = self.n
+        T = self.max_steps
+        k = checkpoint_cada or max(1, int(round((T + 1) ** 0.5)))
+        procesos = max(1, min(num_procesos or os.cpu_count() or 1, n))
+        self.calls_count = 0
+
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        num_checkpoints = T // k + 1
+        tam = _tam_memoria_frente(n, num_checkpoints)
+        from multiprocessing import shared_memory
+        memoria = shared_memory.SharedMemory(create=True, size=tam)
+        try:
+            rodantes, checkpoints_compartidos, celdas = _vistas_frente(memoria.buf, n, num_checkpoints)
+            rodantes[...] = INF_NEG
+            celdas[...] = self.celdas
+
+            contexto = multiprocessing.get_context()
+            barrera = contexto.Barrier(procesos)
+            limites = np.linspace(0, n, procesos + 1).astype(int)
+            trabajadores = [
+                contexto.Process(target=_trabajador_frente,
+                                 args=(memoria.name, n, T, k, int(limites[i]), int(limites[i + 1]), barrera))
+                for i in range(procesos)
+            ]
+            for trabajador in trabajadores:
+                trabajador.start()
+            # Un trabajador muerto por una señal (SIGKILL, OOM) no llega a su except:
+            # si alguno sale con error se rompe la barrera desde aquí para liberar al resto
+            from multiprocessing.connection import wait
+            pendientes = {trabajador.sentinel: trabajador for trabajador in trabajadores}
+            while pendientes:
+                for listo in wait(list(pendientes)):
+                    trabajador = pendientes.pop(listo)
+                    trabajador.join()
+                    if trabajador.exitcode != 0:
+                        barrera.abort()
+            if any(trabajador.exitcode != 0 for trabajador in trabajadores):
+                raise RuntimeError("Un proceso de resuelve_paralelo terminó con error")
+            self.calls_count = n * n * (T + 1)
+
+            resultado = int(rodantes[0, 1, 1])
+            checkpoints = {i * k: checkpoints_compartidos[i].copy() for i in range(num_checkpoints)}
+            del rodantes, checkpoints_compartidos, celdas
+        finally:
+            memoria.close()
+            memoria.unlink()
+        checkpoints[T + 1] = np.full((n, n), INF_NEG, dtype=np.int32)
+        fin_frente = time.time()
+
+        camino_opt = []
+        if resultado != INF_NEG:
+            planos = self._planos_celdas()
+            relleno = np.full((n + 2, n + 2), INF_NEG, dtype=np.int32)
+            camino_opt = self._camino_desde_checkpoints(checkpoints, k, planos, relleno)
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Paralelo por Bandas',
+            'procesos': procesos,
+            'tiempo_frente': fin_frente - start_time,
+            'tiempo_camino': end_time - fin_frente,
+            'checkpoints': num_checkpoints + 1,
+            'memoria_compartida': tam
+        }
+
+        return max(0, resultado), stats, camino_opt
+
+    def actualizar_celda(self, x: int, y: int, valor: Any) -> None:
+        """
+        Cambia el contenido de una celda y la marca para resolver_incremental().
+
+        Args:
+            x: Coordenada fila
+            y: Coordenada columna
+            valor: 'B', 'R', '.' o el código CELDA_* equivalente
+
+        Raises:
+            ValueError: Si la posición está fuera de la cuadrícula o el valor es desconocido
+        """
+        if not self.posicion_valida(x, y):
+            raise ValueError(f"La posición ({x},{y}) está fuera de la cuadrícula")
+        codigo = {'.': CELDA_VACIA, 'R': CELDA_RADAWAY, 'B': CELDA_BOMBA}.get(valor, valor)
+        if codigo not in (CELDA_VACIA, CELDA_RADAWAY, CELDA_BOMBA):
+            raise ValueError(f"Valor de celda desconocido: {valor!r}")
+
+        # No modificar el arreglo (o memmap de solo lectura) que entregó quien llama
+        if not self._celdas_propias or not self.celdas.flags.writeable:
+            self.celdas = np.array(self.celdas)
+            self._celdas_propias = True
+        self.celdas[x, y] = codigo
+        self._grid = None
+        if self._bombas is not None:
+            self._bombas[x * self.n + y] = codigo == CELDA_BOMBA
+        if self._radaway is not None:
+            self._radaway[x * self.n + y] = codigo == CELDA_RADAWAY
+        self._celdas_editadas.append((x, y))
+
+    def resolver_incremental(self) -> Tuple[int, Dict, list]:
+        """
+        Resuelve reutilizando la tabla de la llamada anterior y recalculando solo
+        los estados que pueden depender de las celdas editadas con actualizar_celda().
+
+        La primera llamada llena la tabla completa con el motor vectorizado. En las
+        siguientes, f(x',y',t') solo puede cambiar si un camino desde (x',y') pasa por
+        una celda editada e y aún llega al destino a tiempo, es decir, si
+        |x'-ex| + |y'-ey| + dist(e, destino) <= max_steps - t'. Por cada capa se
+        recalcula solo el rectángulo que cubre ese cono.
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo
+        """
+        n = self.n
+        T = self.max_steps
+        estados_totales = n * n * (T + 1)
+        recalculados = 0
+
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        planos = self._planos_celdas()
+        editadas: Optional[List[Tuple[int, int, int]]] = None
+        if self._valores is None:
+            self._valores = np.full((T + 2, n + 2, n + 2), INF_NEG, dtype=np.int32)
+            self._movimientos = np.full((T + 1, n, n), -1, dtype=np.int8)
+        else:
+            editadas = [(ex, ey, (n - 1 - ex) + (n - 1 - ey)) for ex, ey in set(self._celdas_editadas)]
+
+        def ventanas(t: int) -> Optional[Tuple[int, int, int, int]]:
+            """Rectángulo de la capa t a recalcular (None si no hay nada que recalcular)."""
+            if editadas is None:
+                return 0, n, 0, n
+            # Rectángulo que cubre la unión de los conos de las celdas editadas
+            limites = None
+            for ex, ey, dist_meta in editadas:
+                radio = T - t - dist_meta
+                if radio < 0:
+                    continue
+                caja = (max(0, ex - radio), min(n, ex + radio + 1),
+                        max(0, ey - radio), min(n, ey + radio + 1))
+                if limites is None:
+                    limites = caja
+                else:
+                    limites = (min(limites[0], caja[0]), max(limites[1], caja[1]),
+                               min(limites[2], caja[2]), max(limites[3], caja[3]))
+            return limites
+
+        for t in range(T, -1, -1):
+            ventana = ventanas(t)
+            if ventana is None:
+                continue
+            x0, x1, y0, y1 = ventana
+            capa, mejor_dir = self._capa_ventana(self._valores[t + 1], T - t, planos, x0, x1, y0, y1)
+            self._valores[t, 1 + x0:1 + x1, 1 + y0:1 + y1] = capa
+            self._movimientos[t, x0:x1, y0:y1] = mejor_dir
+            recalculados += (x1 - x0) * (y1 - y0)
+        self._celdas_editadas = []
+        self.calls_count = recalculados
+
+        resultado = int(self._valores[0, 1, 1])
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        # Reconstruir camino óptimo
+        camino_opt = []
+        x, y, t = 0, 0, 0
+        if resultado != INF_NEG:
+            camino_opt.append((x, y))
+            while (x, y) != (n - 1, n - 1):
+                codigo = self._movimientos[t, x, y]
+                if codigo < 0:
+                    break
+                dx, dy = self.directions[codigo]
+                x, y = x + dx, y + dy
+                camino_opt.append((x, y))
+                t += 1
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Incremental',
+            'estados_recalculados': recalculados,
+            'estados_totales': estados_totales
+        }
+
+        return max(0, resultado), stats, camino_opt
+
+    def resuelve_todos_presupuestos(self, max_pasos: int,
+                                    con_caminos: bool = False) -> Tuple[np.ndarray, Dict, List[list]]:
+        """
+        Calcula el máximo de cápsulas para cada límite de pasos k entre el mínimo
+        Manhattan (2n-2) y max_pasos, en una sola pasada.
+
+        f(x,y,t) con límite k solo depende de los pasos restantes r = k - t, así que
+        las capas g(·,·,r) son las mismas para todos los límites: la capa r se obtiene
+        de la r-1 con _capa_ventana y g(0,0,k) es la respuesta para el límite k. Basta
+        con recorrer r de 0 a max_pasos una vez, en lugar de resolver de nuevo por k.
+
+        Args:
+            max_pasos: Límite de pasos más grande a consultar (>= 2n-2)
+            con_caminos: Si es True, también reconstruye el camino óptimo de cada límite
+
+        Returns:
+            Curva con el máximo de cápsulas para los límites 2n-2..max_pasos (-1 si
+            no hay camino con ese límite), estadísticas de rendimiento y la lista de
+            caminos óptimos en el mismo orden (vacía si con_caminos es False)
+        """
+        n = self.n
+        minimo = 2 * n - 2
+        if max_pasos < minimo:
+            raise ValueError(f"max_pasos debe ser al menos {minimo} para n={n}")
+        self.calls_count = 0
+
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        planos = self._planos_celdas()
+        # movimientos[r, x, y]: mejor movimiento con r pasos restantes (solo si se piden caminos)
+        movimientos = np.full((max_pasos + 1, n, n), -1, dtype=np.int8) if con_caminos else None
+        curva = np.full(max_pasos - minimo + 1, -1, dtype=np.int32)
+
+        # Capa r = -1: no quedan pasos en ninguna celda
+        relleno = np.full((n + 2, n + 2), INF_NEG, dtype=np.int32)
+        for r in range(max_pasos + 1):
+            capa, mejor_dir = self._capa_ventana(relleno, r, planos, 0, n, 0, n)
+            relleno[1:-1, 1:-1] = capa
+            if con_caminos:
+                movimientos[r] = mejor_dir
+            if r >= minimo and capa[0, 0] != INF_NEG:
+                curva[r - minimo] = capa[0, 0]
+            self.calls_count += n * n
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        # Reconstruir el camino óptimo de cada límite bajando por r
+        caminos: List[list] = []
+        if con_caminos:
+            for k in range(minimo, max_pasos + 1):
+                camino_opt = []
+                x, y, r = 0, 0, k
+                if curva[k - minimo] >= 0:
+                    camino_opt.append((x, y))
+                    while (x, y) != (n - 1, n - 1):
+                        codigo = movimientos[r, x, y]
+                        if codigo < 0:
+                            break
+                        dx, dy = self.directions[codigo]
+                        x, y = x + dx, y + dy
+                        camino_opt.append((x, y))
+                        r -= 1
+                caminos.append(camino_opt)
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Todos los Presupuestos',
+            'presupuestos': list(range(minimo, max_pasos + 1))
+        }
+
+        return curva, stats, caminos
+
+    def resuelve_recoleccion_unica(self, max_pasos: Optional[int] = None,
+                                   limite_nodos: Optional[int] = 200000,
+                                   limite_tiempo: Optional[float] = None) -> Tuple[int, Dict, list]:
+        """
+        Resuelve con recolección única: cada RadAway cuenta una sola vez aunque el
+        camino vuelva a pasar por su celda.
+
+        El estado (x,y,t) de funcion_capsulas no sabe qué se recogió, así que los
+        demás métodos resuelven una relajación que vuelve a contar las revisitas.
+        Aquí se hace una búsqueda best-first sobre caminos parciales con:
+          - Cota superior admisible: lo recogido + g(x,y,r) - valor(x,y), donde g es
+            la capa relajada con r pasos restantes (la misma de _capa_ventana).
+          - Dominancia: dos caminos en (x,y) con las mismas cápsulas recogidas que aún
+            se pueden volver a visitar son comparables; se descarta el que tiene menos
+            pasos restantes y no más cápsulas.
+          - Presupuesto de nodos/tiempo: al agotarse se devuelve el mejor camino hallado.
+
+        Con el límite por defecto (2n-1) el único largo posible es 2n-2 por paridad, los
+        caminos son monótonos y el resultado coincide con el relajado; las revisitas
+        aparecen con presupuestos mayores (max_pasos).
+
+        Args:
+            max_pasos: Límite de pasos (por defecto self.max_steps)
+            limite_nodos: Máximo de nodos a expandir (None = sin límite)
+            limite_tiempo: Máximo de segundos de búsqueda (None = sin límite)
+
+        Retorna máximo_cápsulas, estadísticas_rendimiento y camino óptimo (el mejor
+        hallado si se agotó el presupuesto; stats['exacto'] indica cuál es el caso)
+        """
+        n = self.n
+        pasos = self.max_steps if max_pasos is None else max_pasos
+        meta = n - 1
+        directions = self.directions
+        bombas, radaway = self.bombas, self.radaway
+
+        self._iniciar_medicion_memoria()
+        start_time = time.time()
+
+        # Capas relajadas g(·,·,r) para r = 0..pasos, en listas para consultas escalares
+        planos = self._planos_celdas()
+        relleno = np.full((n + 2, n + 2), INF_NEG, dtype=np.int32)
+        relajado = []
+        for r in range(pasos + 1):
+            capa, _ = self._capa_ventana(relleno, r, planos, 0, n, 0, n)
+            relleno[1:-1, 1:-1] = capa
+            relajado.append(capa.tolist())
+        cota_relajada = relajado[pasos][0][0]
+
+        # conos[(x, y, r)]: máscara de las cápsulas (bit x*n+y) desde las que aún se
+        # llega al destino pasando por ellas con r pasos desde (x,y); se llena al usarse
+        filas, columnas = np.indices((n, n))
+        capsulas = planos[1].astype(bool)
+        conos: Dict[Tuple[int, int, int], int] = {}
+
+        def relevantes(mascara: int, x: int, y: int, r: int) -> int:
+            """Cápsulas recogidas que todavía se pueden volver a visitar con r pasos."""
+            clave = (x, y, r)
+            cono = conos.get(clave)
+            if cono is None:
+                dentro = capsulas & (np.abs(filas - x) + np.abs(columnas - y) + planos[2] <= r)
+                cono = int.from_bytes(np.packbits(dentro.ravel(), bitorder='little').tobytes(), 'little')
+                conos[clave] = cono
+            return mascara & cono
+
+        # Nodos: posición y padre, para reconstruir caminos
+        nodo_pos: List[Tuple[int, int]] = []
+        nodo_padre: List[int] = []
+
+        def camino_de(nodo: int) -> List[Tuple[int, int]]:
+            camino = []
+            while nodo >= 0:
+                camino.append(nodo_pos[nodo])
+                nodo = nodo_padre[nodo]
+            camino.reverse()
+            return camino
+
+        # Solución inicial: seguir la política relajada contando cada cápsula una vez
+        mejor, mejor_camino = -1, []
+        if cota_relajada != INF_NEG:
+            x, y, r = 0, 0, pasos
+            camino, vistas = [(0, 0)], {0} if radaway[0] else set()
+            while (x, y) != (meta, meta):
+                mejor_valor, sgt = INF_NEG, None
+                for dx, dy in directions:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < n and 0 <= ny < n and relajado[r - 1][nx][ny] > mejor_valor:
+                        mejor_valor, sgt = relajado[r - 1][nx][ny], (nx, ny)
+                x, y = sgt
+                r -= 1
+                camino.append((x, y))
+                if radaway[x * n + y]:
+                    vistas.add(x * n + y)
+            mejor, mejor_camino = len(vistas), camino
+
+        expandidos = 0
+        podados_cota = podados_dominancia = 0
+        frente: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
+        heap = []
+        if cota_relajada != INF_NEG and (0, 0) != (meta, meta):
+            total0 = radaway[0]
+            mascara0 = 1 if radaway[0] else 0
+            nodo_pos.append((0, 0))
+            nodo_padre.append(-1)
+            heapq.heappush(heap, (-cota_relajada, -total0, 0, 0, mascara0))
+
+        agotado = False
+        while heap:
+            cota_neg, total_neg, nodo, t, mascara = heapq.heappop(heap)
+            if -cota_neg <= mejor:
+                # Ningún nodo pendiente puede superar a la mejor solución
+                heap.clear()
+                break
+            if (limite_nodos is not None and expandidos >= limite_nodos) or \
+                    (limite_tiempo is not None and time.time() - start_time >= limite_tiempo):
+                heapq.heappush(heap, (cota_neg, total_neg, nodo, t, mascara))
+                agotado = True
+                break
+            expandidos += 1
+            total = -total_neg
+            x, y = nodo_pos[nodo]
+            r = pasos - t - 1
+            for dx, dy in directions:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < n and 0 <= ny < n) or bombas[nx * n + ny]:
+                    continue
+                futuro = relajado[r][nx][ny] if r >= 0 else INF_NEG
+                if futuro == INF_NEG:
+                    continue
+                c = nx * n + ny
+                nuevo = radaway[c] and not (mascara >> c) & 1
+                total_sgt = total + 1 if nuevo else total
+                mascara_sgt = mascara | (1 << c) if nuevo else mascara
+                if nx == meta and ny == meta:
+                    if total_sgt > mejor:
+                        nodo_pos.append((nx, ny))
+                        nodo_padre.append(nodo)
+                        mejor, mejor_camino = total_sgt, camino_de(len(nodo_pos) - 1)
+                    continue
+                cota = total_sgt + futuro - radaway[c]
+                if cota <= mejor:
+                    podados_cota += 1
+                    continue
+                clave = (nx, ny, relevantes(mascara_sgt, nx, ny, r))
+                pareto = frente.setdefault(clave, [])
+                if any(t2 <= t + 1 and total2 >= total_sgt for t2, total2 in pareto):
+                    podados_dominancia += 1
+                    continue
+                pareto.append((t + 1, total_sgt))
+                nodo_pos.append((nx, ny))
+                nodo_padre.append(nodo)
+                heapq.heappush(heap, (-cota, -total_sgt, len(nodo_pos) - 1, t + 1, mascara_sgt))
+        self.calls_count = expandidos
+
+        # Si se agotó el presupuesto, la mejor cota pendiente acota el óptimo
+        if agotado and heap:
+            cota_superior = max(mejor, -heap[0][0])
+        elif cota_relajada == INF_NEG:
+            cota_superior = -1
+        else:
+            cota_superior = mejor
+
+        end_time = time.time()
+        peak_memory = self._pico_memoria()
+
+        stats = {
+            'execution_time': end_time - start_time,
+            'memory_peak': peak_memory,
+            'function_calls': self.calls_count,
+            'method': 'Recolección Única',
+            'exacto': not agotado,
+            'cota_relajada': max(0, cota_relajada),
+            'cota_superior': max(0, cota_superior),
+            'brecha_relajada': max(0, cota_relajada) - max(0, mejor),
+            'nodos_expandidos': expandidos,
+            'podados_cota': podados_cota,
+            'podados_dominancia': podados_dominancia
+        }
+
+        return max(0, mejor), stats, mejor_camino
+
+    def construir_oraculo(self) -> 'OraculoCapsulas':
+        """
+        Llena la tabla completa f(x,y,t) con el motor vectorizado y la conserva en
+        un OraculoCapsulas para consultas posteriores sin volver a resolver.
+
+        Returns:
+            Oráculo con los valores y mejores movimientos de todos los estados
+        """
+        n = self.n
+        T = self.max_steps
+        planos = self._planos_celdas()
+        tipo = OraculoCapsulas.tipo_valores(T)
+        valores = np.empty((T + 1, n, n), dtype=tipo)
+        movimientos = np.empty((T + 1, n, n), dtype=np.int8)
+
+        capa_sgt = np.full((n, n), INF_NEG, dtype=np.int32)
+        relleno = np.full((n + 2, n + 2), INF_NEG, dtype=np.int32)
+        for t in range(T, -1, -1):
+            capa_sgt, movimientos[t] = self._capa_anterior(capa_sgt, t, planos, relleno)
+            valores[t] = np.where(capa_sgt == INF_NEG, SIN_CAMINO_H, capa_sgt)
+
+        return OraculoCapsulas(valores, movimientos, self.directions)
+
+    def mejores_caminos(self, k: int) -> List[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        Los k mejores caminos distintos desde (0,0), por cápsulas recolectadas.
+
+        Construye el oráculo (una resolución) y enumera con
+        OraculoCapsulas.mejores_caminos.
+        """
+        return self.construir_oraculo().mejores_caminos(k)
+
+
+def _tam_memoria_frente(n: int, num_checkpoints: int) -> int:
+    """Bytes del bloque compartido de resuelve_paralelo."""
+    return 4 * (2 * (n + 2) * (n + 2) + num_checkpoints * n * n) + n * n
+
+
+def _vistas_frente(buf: Any, n: int, num_checkpoints: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vistas NumPy sobre el bloque compartido de resuelve_paralelo: las dos capas
+    rodantes con borde INF_NEG (2, n+2, n+2), los checkpoints (num_checkpoints, n, n)
+    y la cuadrícula compacta (n, n).
+    """
+    tam_rodantes = 2 * (n + 2) * (n + 2)
+    rodantes = np.ndarray((2, n + 2, n + 2), dtype=np.int32, buffer=buf)
+    checkpoints = np.ndarray((num_checkpoints, n, n), dtype=np.int32, buffer=buf, offset=4 * tam_rodantes)
+    celdas = np.ndarray((n, n), dtype=np.uint8, buffer=buf,
+                        offset=4 * (tam_rodantes + num_checkpoints * n * n))
+    return rodantes, checkpoints, celdas
+
+
+def _trabajador_frente(nombre: str, n: int, T: int, k: int, x0: int, x1: int, barrera: Any) -> None:
+    """
+    Proceso de resuelve_paralelo: calcula las filas x0..x1-1 de cada capa, de t = T a 0.
+
+    La capa t se escribe en rodantes[t % 2] leyendo la t+1 de rodantes[(t+1) % 2];
+    tras cada capa se espera en la barrera, así nadie sobrescribe una capa que otro
+    proceso todavía está leyendo. Si algo falla se rompe la barrera para no dejar a
+    los demás esperando; si el proceso muere sin llegar a hacerlo, la rompe
+    resuelve_paralelo al ver su código de salida.
+
+    Con el método fork el proceso hereda tracemalloc activo del padre; se detiene
+    de inmediato, porque el rastreo encarecería cada capa y la memoria de este
+    proceso no forma parte del memory_peak del padre.
+    """
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    from multiprocessing import shared_memory
+    memoria = shared_memory.SharedMemory(name=nombre)
+    try:
+        rodantes, checkpoints, celdas = _vistas_frente(memoria.buf, n, T // k + 1)
+        optimizado = alg_optimizado(celdas, medir_memoria=False)
+        planos = optimizado._planos_celdas()
+        for t in range(T, -1, -1):
+            if x0 < x1:
+                capa, _ = optimizado._capa_ventana(rodantes[(t + 1) % 2], T - t, planos, x0, x1, 0, n)
+                rodantes[t % 2, 1 + x0:1 + x1, 1:-1] = capa
+                if t % k == 0:
+                    checkpoints[t // k, x0:x1] = capa
+            barrera.wait()
+        del rodantes, checkpoints, celdas, optimizado, planos
+    except BaseException:
+        barrera.abort()
+        raise
+    finally:
+        memoria.close()
+
+
+class OraculoCapsulas:
+    """
+    Tabla precalculada de f(x,y,t) para responder en O(1) desde cualquier estado.
+
+    Guarda los valores en int16 (int32 si max_steps no cabe) con SIN_CAMINO_H para
+    los estados sin camino, y el mejor movimiento como índice int8 en las
+    direcciones del solver que lo construyó.
+    """
+
+    def __init__(self, valores: np.ndarray, movimientos: np.ndarray,
+                 direcciones: List[Tuple[int, int]] = DIRECCIONES):
+        """
+        Args:
+            valores: Tabla (max_steps+1, n, n) de valores, SIN_CAMINO_H si no hay camino
+            movimientos: Tabla (max_steps+1, n, n) con el índice del mejor movimiento (-1 si no hay)
+            direcciones: Direcciones a las que apuntan los índices de `movimientos`
+                (alg_optimizado.directions)
+        """
+        self.valores = valores
+        self.movimientos = movimientos
+        self.direcciones = direcciones
+        self.max_steps = valores.shape[0] - 1
+        self.n = valores.shape[1]
+
+    @staticmethod
+    def tipo_valores(max_steps: int) -> type:
+        """Tipo de la tabla de valores: int16 mientras el máximo posible (max_steps+1) quepa."""
+        return np.int16 if max_steps + 1 <= np.iinfo(np.int16).max else np.int32
+
+    def _estado_valido(self, x: int, y: int, t: int) -> bool:
+        return 0 <= x < self.n and 0 <= y < self.n and 0 <= t <= self.max_steps
+
+    def mejor_desde(self, x: int, y: int, t: int) -> int:
+        """
+        Máximo de cápsulas desde (x,y) en el paso t, igual que funcion_capsulas(x, y, t).
+
+        Returns:
+            Valor óptimo, o INF_NEG si no hay camino válido (o el estado está fuera de rango)
+        """
+        if not self._estado_valido(x, y, t):
+            return INF_NEG
+        valor = int(self.valores[t, x, y])
+        return INF_NEG if valor == SIN_CAMINO_H else valor
+
+    def siguiente_movimiento(self, x: int, y: int, t: int) -> Optional[Tuple[int, int]]:
+        """
+        Siguiente celda del camino óptimo desde (x,y) en el paso t.
+
+        Returns:
+            Posición (x, y) a la que moverse, o None en el destino o si no hay camino
+        """
+        if not self._estado_valido(x, y, t):
+            return None
+        codigo = self.movimientos[t, x, y]
+        if codigo < 0:
+            return None
+        dx, dy = self.direcciones[codigo]
+        return x + dx, y + dy
+
+    def camino_desde(self, x: int, y: int, t: int = 0) -> List[Tuple[int, int]]:
+        """
+        Camino óptimo completo desde (x,y) en el paso t, encadenando siguiente_movimiento.
+
+        Returns:
+            Lista de posiciones hasta el destino (vacía si no hay camino)
+        """
+        if self.mejor_desde(x, y, t) == INF_NEG:
+            return []
+        camino = [(x, y)]
+        siguiente = self.siguiente_movimiento(x, y, t)
+        while siguiente is not None:
+            x, y = siguiente
+            t += 1
+            camino.append((x, y))
+            siguiente = self.siguiente_movimiento(x, y, t)
+        return camino
+
+    def mejores_caminos(self, k: int, x: int = 0, y: int = 0,
+                        t: int = 0) -> List[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        Enumera los k mejores caminos distintos desde (x,y,t) hasta el destino.
+
+        Búsqueda best-first perezosa sobre la tabla de valores: la prioridad de un
+        prefijo es lo ya recolectado más mejor_desde(último estado), que es exacta,
+        así que los caminos completos salen del heap en orden no creciente de
+        cápsulas. Moverse a un vecino cuesta lo que le falta a su valor para igualar
+        el del mejor vecino; el valor de la celda se cancela y no hace falta la
+        cuadrícula. Los empates se resuelven en profundidad y en el orden de
+        self.direcciones, por lo que el primer camino es camino_desde(x, y, t). Cada
+        camino cuesta O(largo · log heap) además de la tabla.
+
+        Args:
+            k: Cantidad máxima de caminos a devolver
+            x, y, t: Estado inicial (por defecto el inicio del refugio)
+
+        Returns:
+            Lista de (cápsulas, camino) con a lo sumo k elementos, de mejor a peor
+        """
+        n, T = self.n, self.max_steps
+        if k <= 0 or self.mejor_desde(x, y, t) == INF_NEG:
+            return []
+        # Prefijos como lista enlazada: nodos[i] = (padre, x, y); el heap guarda índices
+        nodos: List[Tuple[int, int, int]] = [(-1, x, y)]
+        heap = [(-self.mejor_desde(x, y, t), 0, 0, t)]
+        caminos: List[Tuple[int, List[Tuple[int, int]]]] = []
+        while heap and len(caminos) < k:
+            cota_neg, _, i, t = heapq.heappop(heap)
+            _, x, y = nodos[i]
+            if (x, y) == (n - 1, n - 1):
+                camino = []
+                while i >= 0:
+                    padre, cx, cy = nodos[i]
+                    camino.append((cx, cy))
+                    i = padre
+                caminos.append((-cota_neg, camino[::-1]))
+                continue
+            if t >= T:
+                continue
+            vecinos = []
+            for dx, dy in self.direcciones:
+                valor = self.mejor_desde(x + dx, y + dy, t + 1)
+                if valor != INF_NEG:
+                    vecinos.append((x + dx, y + dy, valor))
+            if not vecinos:
+                continue
+            mejor_vecino = max(valor for _, _, valor in vecinos)
+            # En orden inverso: con el desempate por -índice, direcciones[0] sale primero
+            for nx, ny, valor in reversed(vecinos):
+                j = len(nodos)
+                nodos.append((i, nx, ny))
+                heapq.heappush(heap, (cota_neg + mejor_vecino - valor, -j, j, t + 1))
+        return caminos
+
+    def guardar(self, ruta: str) -> None:
+        """
+        Guarda el oráculo: cabecera de 16 bytes (FIRMA_ORACULO, n y max_steps como
+        uint32 little-endian) seguida de la tabla de valores y la de movimientos.
+        """
+        cabecera = (FIRMA_ORACULO + int(self.n).to_bytes(4, 'little')
+                    + int(self.max_steps).to_bytes(4, 'little'))
+        tipo = self.tipo_valores(self.max_steps)
+        with open(ruta, 'wb') as archivo:
+            archivo.write(cabecera)
+            archivo.write(np.ascontiguousarray(self.valores, dtype=tipo).tobytes())
+            archivo.write(np.ascontiguousarray(self.movimientos, dtype=np.int8).tobytes())
+
+    @classmethod
+    def cargar(cls, ruta: str, modo: str = 'r') -> 'OraculoCapsulas':
+        """
+        Abre un oráculo guardado con numpy.memmap; las consultas solo leen las
+        páginas que tocan.
+
+        Args:
+            ruta: Archivo a abrir
+            modo: Modo de numpy.memmap ('r' solo lectura, 'c' copy-on-write)
+
+        Raises:
+            ValueError: Si el archivo no tiene la firma del oráculo
+        """
+        with open(ruta, 'rb') as archivo:
+            cabecera = archivo.read(TAM_CABECERA)
+        if len(cabecera) < TAM_CABECERA or not cabecera.startswith(FIRMA_ORACULO):
+            raise ValueError(f"{ruta} no es un oráculo del refugio")
+        inicio = len(FIRMA_ORACULO)
+        n = int.from_bytes(cabecera[inicio:inicio + 4], 'little')
+        max_steps = int.from_bytes(cabecera[inicio + 4:inicio + 8], 'little')
+        forma = (max_steps + 1, n, n)
+        tipo = cls.tipo_valores(max_steps)
+        valores = np.memmap(ruta, dtype=tipo, mode=modo, offset=TAM_CABECERA, shape=forma)
+        desplazamiento = TAM_CABECERA + valores.nbytes
+        movimientos = np.memmap(ruta, dtype=np.int8, mode=modo, offset=desplazamiento, shape=forma)
+        return cls(valores, movimientos)
+
+
+def resolver_lote(grids: List[List[List[str]]], tam_lote: int = 256) -> List[Tuple[int, list]]:
+    """
+    Resuelve muchas cuadrículas a la vez con el motor vectorizado.
+
+    Las cuadrículas se agrupan por tamaño n y cada grupo se apila en un arreglo
+    (K, n, n), de modo que cada capa de pasos se calcula para las K cuadrículas
+    en una sola operación de NumPy. Luego se reconstruye el camino de cada una.
+
+    Args:
+        grids: Lista de cuadrículas (pueden tener distintos tamaños)
+        tam_lote: Máximo de cuadrículas apiladas por pasada, para acotar la memoria
+            de la tabla de movimientos (tam_lote × 2n × n × n bytes)
+
+    Returns:
+        Lista de (máximo_cápsulas, camino óptimo) en el mismo orden que `grids`
+    """
+    resultados: List[Tuple[int, list]] = [(0, [])] * len(grids)
+
+    # Agrupar índices por tamaño de cuadrícula
+    por_tamano: Dict[int, List[int]] = {}
+    for i, grid in enumerate(grids):
+        por_tamano.setdefault(len(grid), []).append(i)
+
+    for n, indices in por_tamano.items():
+        # Instancia de referencia para n, max_steps y las direcciones
+        referencia = alg_optimizado(grids[indices[0]])
+        T = referencia.max_steps
+        _, _, distancia_meta = referencia._planos_celdas()
+
+        for inicio in range(0, len(indices), tam_lote):
+            bloque = indices[inicio:inicio + tam_lote]
+            k = len(bloque)
+            celdas = np.stack([a_grid_compacto(grids[i]) for i in bloque])
+            planos = (celdas == CELDA_BOMBA, (celdas == CELDA_RADAWAY).astype(np.int32), distancia_meta)
+
+            parent = np.empty((T + 1, k, n, n), dtype=np.int8)
+            capa_sgt = np.full((k, n, n), INF_NEG, dtype=np.int32)
+            relleno = np.full((k, n + 2, n + 2), INF_NEG, dtype=np.int32)
+            for t in range(T, -1, -1):
+                capa_sgt, parent[t] = referencia._capa_anterior(capa_sgt, t, planos, relleno)
+
+            # Reconstruir el camino óptimo de cada cuadrícula del bloque
+            for j, i in enumerate(bloque):
+                resultado = int(capa_sgt[j, 0, 0])
+                camino_opt = []
+                x, y, t = 0, 0, 0
+                if resultado != INF_NEG:
+                    camino_opt.append((x, y))
+                    while (x, y) != (n - 1, n - 1):
+                        codigo = parent[t, j, x, y]
+                        if codigo < 0:
+                            break
+                        dx, dy = referencia.directions[codigo]
+                        x, y = x + dx, y + dy
+                        camino_opt.append((x, y))
+                        t += 1
+                resultados[i] = (max(0, resultado), camino_opt)
+
+    return resultados
+
+
+def graficos_comparativos(todos_resultados: List[Dict]) -> None:
+    """
+    Crea gráficos comparativos de rendimiento entre Array 3D y Dictionary Hash.
+    
+    Args:
+        todos_resultados: Lista de resultados de experimentos
+    """
+    if len(todos_resultados) < 2:
+        print("Se necesitan al menos 2 experimentos para generar gráficos comparativos.")
+        return
+
+    # Importación diferida: matplotlib solo se carga cuando se dibuja un gráfico
+    import matplotlib.pyplot as plt
+
+    sizes = [result['size'] for result in todos_resultados]
+    array_times = [result['array_avg_time'] for result in todos_resultados]
+    dict_times = [result['dict_avg_time'] for result in todos_resultados]
+    array_memory = [result['array_avg_memory'] for result in todos_resultados]
+    dict_memory = [result['dict_avg_memory'] for result in todos_resultados]
+    array_calls = [result['array_avg_calls'] for result in todos_resultados]
+    dict_calls = [result['dict_avg_calls'] for result in todos_resultados]
+
+    # Crear subplots
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+    fig.suptitle('Comparación de Rendimiento: Array 3D vs Dictionary Hash', fontsize=16, fontweight='bold')
+    
+    # Gráfico 1: Tiempo de ejecución
+    ax1.plot(sizes, array_times, 'b-o', label='Array 3D', linewidth=2, markersize=8)
+    ax1.plot(sizes, dict_times, 'r-s', label='Dictionary Hash', linewidth=2, markersize=8)
+    if all('vect_avg_time' in result for result in todos_resultados):
+        vect_times = [result['vect_avg_time'] for result in todos_resultados]
+        ax1.plot(sizes, vect_times, 'g-^', label='Vectorizado NumPy', linewidth=2, markersize=8)
+    ax1.set_xlabel('Tamaño del mapa (n)', fontsize=12)
+    ax1.set_ylabel('Tiempo promedio (segundos)', fontsize=12)
+    ax1.set_title('Tiempo de Ejecución', fontsize=14, fontweight='bold')
+    ax1.legend(fontsize=11)
+    ax1.grid(True, alpha=0.3)
+    ax1.set_yscale('log')
+    
+    # Gráfico 2: Uso de memoria
+    x_pos = np.arange(len(sizes))
+    width = 0.35
+    ax2.bar(x_pos - width/2, array_memory, width, label='Array 3D', alpha=0.8, color='blue')
+    ax2.bar(x_pos + width/2, dict_memory, width, label='Dictionary Hash', alpha=0.8, color='red')
+    ax2.set_xlabel('Tamaño del mapa (n)', fontsize=12)
+    ax2.set_ylabel('Memoria promedio (KB)', fontsize=12)
+    ax2.set_title('Uso de Memoria', fontsize=14, fontweight='bold')
+    ax2.set_xticks(x_pos)
+    ax2.set_xticklabels(sizes)
+    ax2.legend(fontsize=11)
+    ax2.grid(True, alpha=0.3)
+    
+    # Gráfico 3: Factor de velocidad (speedup)
+    speedup_factors = [a/d if d > 0 else 1 for a, d in zip(array_times, dict_times)]
+    colors = ['green' if s < 1 else 'orange' if s < 1.5 else 'red' for s in speedup_factors]
+    ax3.bar(sizes, speedup_factors, color=colors, alpha=0.7)
+    ax3.axhline(y=1, color='black', linestyle='--', alpha=0.7, label='Mismo rendimiento')
+    ax3.set_xlabel('Tamaño del mapa (n)', fontsize=12)
+    ax3.set_ylabel('Factor de velocidad (Array/Dict)', fontsize=12)
+    ax3.set_title('Factor de Velocidad Relativa', fontsize=14, fontweight='bold')
+    ax3.legend(fontsize=11)
+    ax3.grid(True, alpha=0.3)
+    
+    # Gráfico 4: Número de llamadas recursivas
+    ax4.semilogy(sizes, array_calls, 'b-o', label='Array 3D', linewidth=2, markersize=8)
+    ax4.semilogy(sizes, dict_calls, 'r-s', label='Dictionary Hash', linewidth=2, markersize=8)
+    ax4.set_xlabel('Tamaño del mapa (n)', fontsize=12)
+    ax4.set_ylabel('Llamadas promedio (escala log)', fontsize=12)
+    ax4.set_title('Número de Llamadas Recursivas', fontsize=14, fontweight='bold')
+    ax4.legend(fontsize=11)
+    ax4.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    plt.show()
+    
+    # Mostrar análisis textual
+    print(f"\n{'='*80}")
+    print("ANÁLISIS COMPARATIVO DE RENDIMIENTO")
+    print(f"{'='*80}")
+    
+    for i, size in enumerate(sizes):
         speedup = speedup_factors[i]
         memory_ratio = array_memory[i] / dict_memory[i] if dict_memory[i] > 0 else 1
         
@@ -427,19 +2592,370 @@ def random_map(n: int, bomb_probability: float = 0.2, radaway_probability: float
     return grid
 
 
-def mostrar_map(grid: List[List[str]]) -> None:
-    """
-    Imprime la cuadrícula de forma legible.
-    
-    Args:
-        grid: Cuadrícula a imprimir
-    """
-    n = len(grid)
-    print("Cuadrícula del refugio:")
-    print("  " + " ".join(f"{j:2}" for j in range(n)))
-    for i in range(n):
-        print(f"{i:2} " + " ".join(f"{cell:2}" for cell in grid[i]))
-    print()
+def random_map_np(n: int, bomb_probability: float = 0.2, radaway_probability: float = 0.3,
+                  semilla: Optional[Any] = None, compacto: bool = False) -> Any:
+    """
+    Versión vectorizada de random_map basada en numpy.random.Generator.
+
+    Genera toda la cuadrícula con un único sorteo de n×n uniformes y aplica las
+    mismas reglas que random_map: bomba si u < bomb_probability, RadAway si
+    u < bomb_probability + radaway_probability, vacía en otro caso; (0,0) siempre
+    vacía y (n-1,n-1) sin bomba (RadAway con probabilidad radaway_probability).
+
+    Args:
+        n: Tamaño de la cuadrícula (n×n)
+        bomb_probability: Probabilidad de que una celda contenga una bomba (0.0-1.0)
+        radaway_probability: Probabilidad de que una celda contenga RadAway (0.0-1.0)
+        semilla: Semilla entera o un np.random.Generator ya creado; None usa entropía del sistema
+        compacto: Si es True retorna directamente la forma compacta (uint8 n×n)
+
+    Retorna:
+        Cuadrícula n×n con el mismo formato que random_map, o su forma compacta
+    """
+    # default_rng devuelve el mismo Generator si ya se le pasa uno
+    rng = np.random.default_rng(semilla)
+    aleatorio = rng.random((n, n))
+    celdas = np.full((n, n), CELDA_VACIA, dtype=np.uint8)
+    celdas[aleatorio < bomb_probability + radaway_probability] = CELDA_RADAWAY
+    celdas[aleatorio < bomb_probability] = CELDA_BOMBA
+
+    # Garantizar que las posiciones críticas (inicio y fin) no tengan bombas
+    celdas[0, 0] = CELDA_VACIA
+    celdas[n - 1, n - 1] = CELDA_RADAWAY if aleatorio[n - 1, n - 1] < radaway_probability else CELDA_VACIA
+    return celdas if compacto else grid_desde_compacto(celdas)
+
+
+def generar_mapas(n: int, cantidad: Optional[int] = None, bomb_probability: float = 0.2,
+                  radaway_probability: float = 0.3, semilla: Optional[int] = None,
+                  compacto: bool = False):
+    """
+    Generador perezoso de cuadrículas aleatorias reproducibles.
+
+    Todas las cuadrículas salen de un mismo np.random.Generator, así que la misma
+    semilla produce siempre la misma secuencia y solo se construye una cuadrícula
+    a la vez.
+
+    Args:
+        n: Tamaño de cada cuadrícula
+        cantidad: Número de cuadrículas a generar (None = sin límite)
+        bomb_probability: Probabilidad de bomba por celda
+        radaway_probability: Probabilidad de RadAway por celda
+        semilla: Semilla del generador (None usa entropía del sistema)
+        compacto: Si es True entrega la forma compacta (uint8 n×n)
+
+    Yields:
+        Cuadrículas n×n con el formato de random_map, o su forma compacta
+    """
+    rng = np.random.default_rng(semilla)
+    generadas = 0
+    while cantidad is None or generadas < cantidad:
+        yield random_map_np(n, bomb_probability, radaway_probability, rng, compacto)
+        generadas += 1
+
+
+def mostrar_map(grid: List[List[str]]) -> None:
+    """
+    Imprime la cuadrícula de forma legible.
+    
+    Args:
+        grid: Cuadrícula a imprimir (lista de listas o forma compacta)
+    """
+    print(formatear_map(grid))
+
+
+def formatear_map(grid: Any) -> str:
+    """
+    Retorna el texto que imprime mostrar_map (también es el formato de guardar_grid_texto).
+
+    Args:
+        grid: Cuadrícula (lista de listas o forma compacta)
+    """
+    if isinstance(grid, np.ndarray):
+        grid = grid_desde_compacto(grid)
+    n = len(grid)
+    lineas = ["Cuadrícula del refugio:", "  " + " ".join(f"{j:2}" for j in range(n))]
+    for i in range(n):
+        lineas.append(f"{i:2} " + " ".join(f"{cell:2}" for cell in grid[i]))
+    return "\n".join(lineas) + "\n"
+
+
+# Cabecera del formato binario: firma de 8 bytes, n (uint32 little-endian) y relleno hasta 16 bytes
+FIRMA_BINARIA = b'FALLOUT1'
+TAM_CABECERA = 16
+
+# Firma de OraculoCapsulas.guardar; la cabecera también ocupa TAM_CABECERA bytes
+FIRMA_ORACULO = b'FALLORC1'
+
+
+def guardar_grid_texto(grid: Any, ruta: str) -> None:
+    """
+    Guarda la cuadrícula en texto plano, con el mismo formato que imprime mostrar_map.
+
+    Args:
+        grid: Cuadrícula (lista de listas o forma compacta)
+        ruta: Archivo de destino
+    """
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write(formatear_map(grid))
+
+
+def cargar_grid_texto(ruta: str) -> List[List[str]]:
+    """
+    Carga una cuadrícula en el formato de mostrar_map.
+
+    También acepta filas sin la cabecera ni los índices (por ejemplo ". R B" o ".RB").
+
+    Args:
+        ruta: Archivo a leer
+
+    Returns:
+        Cuadrícula como lista de listas de 'B'/'R'/'.'
+
+    Raises:
+        ValueError: Si la cuadrícula no es cuadrada o tiene símbolos desconocidos
+    """
+    grid = []
+    with open(ruta, encoding='utf-8') as archivo:
+        for linea in archivo:
+            tokens = linea.split()
+            if not tokens or linea.startswith("Cuadrícula") or all(t.isdigit() for t in tokens):
+                continue
+            if tokens[0].isdigit():
+                tokens = tokens[1:]
+            fila = list(tokens[0]) if len(tokens) == 1 else tokens
+            grid.append(fila)
+
+    n = len(grid)
+    if any(len(fila) != n for fila in grid):
+        raise ValueError(f"La cuadrícula de {ruta} no es de {n}×{n}")
+    if any(celda not in ('.', 'R', 'B') for fila in grid for celda in fila):
+        raise ValueError(f"La cuadrícula de {ruta} contiene símbolos distintos de '.', 'R' y 'B'")
+    return grid
+
+
+def guardar_grid_binario(grid: Any, ruta: str) -> None:
+    """
+    Guarda la cuadrícula en formato binario: cabecera de 16 bytes y un uint8 por celda
+    (códigos CELDA_*, en orden de filas).
+
+    Args:
+        grid: Cuadrícula (lista de listas o forma compacta)
+        ruta: Archivo de destino
+    """
+    celdas = a_grid_compacto(grid)
+    cabecera = FIRMA_BINARIA + int(celdas.shape[0]).to_bytes(4, 'little')
+    with open(ruta, 'wb') as archivo:
+        archivo.write(cabecera.ljust(TAM_CABECERA, b'\0'))
+        archivo.write(np.ascontiguousarray(celdas).tobytes())
+
+
+def cargar_grid_binario(ruta: str, modo: str = 'c') -> np.memmap:
+    """
+    Abre una cuadrícula binaria con numpy.memmap, sin leerla completa a memoria.
+
+    El resultado es la forma compacta (uint8 n×n) y se puede pasar directo a
+    alg_optimizado o resolver_lote.
+
+    Args:
+        ruta: Archivo a abrir
+        modo: Modo de numpy.memmap; 'c' (copy-on-write) permite editar celdas en
+            memoria sin modificar el archivo, 'r' es solo lectura
+
+    Raises:
+        ValueError: Si el archivo no tiene la firma del formato binario
+    """
+    with open(ruta, 'rb') as archivo:
+        cabecera = archivo.read(TAM_CABECERA)
+    if not cabecera.startswith(FIRMA_BINARIA):
+        raise ValueError(f"{ruta} no es una cuadrícula binaria del refugio")
+    n = int.from_bytes(cabecera[len(FIRMA_BINARIA):len(FIRMA_BINARIA) + 4], 'little')
+    return np.memmap(ruta, dtype=np.uint8, mode=modo, offset=TAM_CABECERA, shape=(n, n))
+
+
+def cargar_grid(ruta: str) -> Any:
+    """
+    Carga una cuadrícula detectando el formato por su firma: binario (memmap) o texto.
+    """
+    with open(ruta, 'rb') as archivo:
+        es_binario = archivo.read(len(FIRMA_BINARIA)) == FIRMA_BINARIA
+    return cargar_grid_binario(ruta) if es_binario else cargar_grid_texto(ruta)
+
+
+def huella_grid(grid: Any, max_steps: Optional[int] = None) -> str:
+    """
+    Huella de una cuadrícula para usar como clave de caché: BLAKE2b de sus bytes
+    compactos junto con n y max_steps (por defecto 2n-1).
+    """
+    celdas = np.ascontiguousarray(a_grid_compacto(grid))
+    n = celdas.shape[0]
+    pasos = 2 * n - 1 if max_steps is None else max_steps
+    h = hashlib.blake2b(digest_size=16)
+    h.update(n.to_bytes(4, 'little') + pasos.to_bytes(4, 'little'))
+    h.update(celdas.tobytes())
+    return h.hexdigest()
+
+
+class CacheResultados:
+    """
+    Caché de resultados por huella de cuadrícula, con dos niveles:
+      - memoria: LRU (OrderedDict) de hasta `capacidad` entradas
+      - disco (opcional): un archivo sqlite limitado a `max_bytes`; al superarlo se
+        eliminan las entradas usadas hace más tiempo
+
+    Cada entrada guarda (máximo_cápsulas, estadísticas, camino) de un método, y la
+    clave es huella_grid(grid, max_steps) más el prefijo del método.
+    """
+
+    def __init__(self, ruta: Optional[str] = None, capacidad: int = 1024,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            ruta: Archivo sqlite del nivel en disco (None = solo memoria)
+            capacidad: Entradas máximas del nivel en memoria
+            max_bytes: Tamaño máximo de los valores guardados en disco
+        """
+        self.capacidad = capacidad
+        self.max_bytes = max_bytes
+        self._memoria: 'OrderedDict[str, Tuple[int, Dict, list]]' = OrderedDict()
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+        self.tiempo_ahorrado = 0.0
+        self.tiempo_resolucion = 0.0
+        self.ultimo_nivel: Optional[str] = None
+        self._conexion = None
+        if ruta is not None:
+            import sqlite3
+            self._conexion = sqlite3.connect(ruta, timeout=30)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultados ("
+                "clave TEXT PRIMARY KEY, valor TEXT NOT NULL, tam INTEGER NOT NULL, ultimo_uso REAL NOT NULL)")
+            self._conexion.commit()
+
+    def _recordar(self, clave: str, valor: Tuple[int, Dict, list]) -> None:
+        """Inserta en el nivel en memoria, descartando la entrada menos usada si no cabe."""
+        self._memoria[clave] = valor
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.capacidad:
+            self._memoria.popitem(last=False)
+
+    def obtener(self, clave: str) -> Optional[Tuple[int, Dict, list]]:
+        """
+        Busca una entrada en memoria y luego en disco (promoviéndola a memoria).
+        El nivel que respondió queda en self.ultimo_nivel ('memoria', 'disco' o 'miss').
+
+        Returns:
+            (máximo_cápsulas, estadísticas, camino) o None si no está
+        """
+        if clave in self._memoria:
+            self._memoria.move_to_end(clave)
+            self.hits_memoria += 1
+            self.ultimo_nivel = 'memoria'
+            return self._memoria[clave]
+        if self._conexion is not None:
+            fila = self._conexion.execute(
+                "SELECT valor FROM resultados WHERE clave = ?", (clave,)).fetchone()
+            if fila is not None:
+                self._conexion.execute(
+                    "UPDATE resultados SET ultimo_uso = ? WHERE clave = ?", (time.time(), clave))
+                self._conexion.commit()
+                datos = json.loads(fila[0])
+                valor = (datos['resultado'], datos['stats'], [tuple(p) for p in datos['camino']])
+                self._recordar(clave, valor)
+                self.hits_disco += 1
+                self.ultimo_nivel = 'disco'
+                return valor
+        self.misses += 1
+        self.ultimo_nivel = 'miss'
+        return None
+
+    def guardar(self, clave: str, valor: Tuple[int, Dict, list]) -> None:
+        """Guarda una entrada en memoria y, si hay nivel en disco, en sqlite."""
+        self._recordar(clave, valor)
+        if self._conexion is None:
+            return
+        resultado, stats, camino = valor
+        # default convierte escalares de NumPy que algunos métodos dejan en stats
+        texto = json.dumps({'resultado': resultado, 'stats': stats, 'camino': camino},
+                           default=lambda o: o.item())
+        tam = len(texto)
+        if tam > self.max_bytes:
+            return
+        # El límite se comprueba contra la suma real en sqlite dentro de una
+        # transacción de escritura: varios procesos pueden compartir el archivo
+        self._conexion.execute("BEGIN IMMEDIATE")
+        try:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO resultados (clave, valor, tam, ultimo_uso) VALUES (?, ?, ?, ?)",
+                (clave, texto, tam, time.time()))
+            # Desalojo: las entradas usadas hace más tiempo, hasta volver bajo el límite
+            while self._bytes_en_disco() > self.max_bytes:
+                fila = self._conexion.execute(
+                    "SELECT clave FROM resultados ORDER BY ultimo_uso LIMIT 1").fetchone()
+                if fila is None:
+                    break
+                self._conexion.execute("DELETE FROM resultados WHERE clave = ?", fila)
+            self._conexion.commit()
+        except BaseException:
+            self._conexion.rollback()
+            raise
+
+    def _bytes_en_disco(self) -> int:
+        """Suma de los tamaños guardados en sqlite (0 sin nivel en disco)."""
+        if self._conexion is None:
+            return 0
+        return self._conexion.execute("SELECT COALESCE(SUM(tam), 0) FROM resultados").fetchone()[0]
+
+    def resolver(self, grid: Any, prefijo: str = 'array', metodo: Any = None) -> Tuple[int, Dict, list]:
+        """
+        Resuelve una cuadrícula pasando por la caché.
+
+        Args:
+            grid: Cuadrícula (lista de listas o forma compacta)
+            prefijo: Prefijo del método en METODOS_EXPERIMENTO; forma parte de la clave
+            metodo: Función que recibe un alg_optimizado (por defecto la de `prefijo`)
+
+        Returns:
+            (máximo_cápsulas, estadísticas, camino). En un acierto las estadísticas son
+            las de la resolución original, más 'cache' = 'memoria' o 'disco'
+        """
+        optimizado = alg_optimizado(grid)
+        clave = f"{huella_grid(optimizado.celdas, optimizado.max_steps)}:{prefijo}"
+        guardado = self.obtener(clave)
+        if guardado is not None:
+            resultado, stats, camino = guardado
+            self.tiempo_ahorrado += stats['execution_time']
+            return resultado, dict(stats, cache=self.ultimo_nivel), list(camino)
+        if metodo is None:
+            metodo = next(m for _, p, m in METODOS_EXPERIMENTO if p == prefijo)
+        resultado, stats, camino = metodo(optimizado)
+        self.tiempo_resolucion += stats['execution_time']
+        self.guardar(clave, (resultado, dict(stats), list(camino)))
+        return resultado, dict(stats, cache='miss'), camino
+
+    def estadisticas(self) -> Dict:
+        """
+        Aciertos por nivel, fallos, tasa de aciertos y segundos de resolución evitados
+        (suma de execution_time de las entradas servidas desde la caché).
+        """
+        consultas = self.hits_memoria + self.hits_disco + self.misses
+        return {
+            'hits_memoria': self.hits_memoria,
+            'hits_disco': self.hits_disco,
+            'misses': self.misses,
+            'hit_rate': (self.hits_memoria + self.hits_disco) / consultas if consultas else 0.0,
+            'tiempo_ahorrado': self.tiempo_ahorrado,
+            'tiempo_resolucion': self.tiempo_resolucion,
+            'entradas_memoria': len(self._memoria),
+            'bytes_disco': self._bytes_en_disco()
+        }
+
+    def cerrar(self) -> None:
+        """Cierra la conexión sqlite (si hay nivel en disco)."""
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
 
 
 def experimentos_comp(n: int, num_trials: int = 3) -> None:
@@ -539,48 +3055,108 @@ def mostrar_menu() -> int:
     print("3. Ejecutar experimento para n = 30")
     print("4. Ejecutar experimento para n = 40")
     print("5. Ejecutar TODOS los experimentos (n = 10, 20, 30, 40)")
-    print("6. Salir del programa")
+    print("6. Benchmark de resolución por lotes (n = 10, 20, 30, 40)")
+    print("7. Ejecutar TODOS los experimentos en paralelo (todos los núcleos)")
+    print("8. Salir del programa")
     print("-"*70)
     
     while True:
         try:
-            choice = int(input("Ingrese su opción (1-6): "))
-            if 1 <= choice <= 6:
+            choice = int(input("Ingrese su opción (1-8): "))
+            if 1 <= choice <= 8:
                 return choice
             else:
-                print("Opción inválida. Por favor ingrese un número entre 1 y 6.")
+                print("Opción inválida. Por favor ingrese un número entre 1 y 8.")
         except ValueError:
             print("Por favor ingrese un número válido.")
 
 
-def unico_exp(n: int) -> Dict:
+# Métodos comparados en los experimentos:
+# (nombre mostrado, prefijo en el resultado, método de alg_optimizado)
+METODOS_EXPERIMENTO = [
+    ('Array 3D', 'array', alg_optimizado.resuelve_con_array),
+    ('Dictionary Hash', 'dict', alg_optimizado.resuelve_hash),
+    ('Hash empaquetado', 'dict_int', alg_optimizado.resuelve_hash_empaquetado),
+    ('Hash por capas', 'dict_capas', lambda opt: opt.resuelve_hash_empaquetado(por_capas=True)),
+    ('Vectorizado NumPy', 'vect', alg_optimizado.resuelve_vectorizado),
+    ('Bajo memoria', 'lowmem', alg_optimizado.resuelve_bajo_memoria),
+    ('Array compacto', 'compact', alg_optimizado.resuelve_compacto),
+    ('Array 3D podado', 'array_poda', lambda opt: opt.resuelve_con_array(podar=True)),
+    ('Hash podado', 'dict_poda', lambda opt: opt.resuelve_hash(podar=True)),
+    ('Array sin padres', 'array_sp', lambda opt: opt.resuelve_con_array(sin_padres=True)),
+    ('Hash sin padres', 'dict_sp', lambda opt: opt.resuelve_hash(sin_padres=True)),
+    ('Pila explícita', 'pila', alg_optimizado.resuelve_pila),
+    ('Frontera dispersa', 'frontera', alg_optimizado.resuelve_frontera),
+    ('Automático', 'auto', alg_optimizado.resuelve_auto),
+]
+
+# Variantes con instrumentar=True que usa unico_exp para los métodos memoizados
+METODOS_INSTRUMENTADOS = {
+    'array': lambda opt: opt.resuelve_con_array(instrumentar=True),
+    'array_sp': lambda opt: opt.resuelve_con_array(sin_padres=True, instrumentar=True),
+    'dict': lambda opt: opt.resuelve_hash(instrumentar=True),
+    'dict_int': lambda opt: opt.resuelve_hash_empaquetado(instrumentar=True),
+    'pila': lambda opt: opt.resuelve_pila(instrumentar=True),
+}
+
+
+def resumen_experimento(n: int, stats_totales: Dict[str, Dict], num_trials: int) -> Dict:
+    """
+    Convierte las estadísticas acumuladas por método en el diccionario de promedios
+    que consume graficos_comparativos.
+
+    Args:
+        n: Tamaño de la cuadrícula
+        stats_totales: Sumas de execution_time, memory_peak y function_calls por prefijo
+        num_trials: Número de pruebas acumuladas
+    """
+    resumen = {'size': n}
+    for prefijo, totales in stats_totales.items():
+        resumen[f'{prefijo}_avg_time'] = totales['execution_time'] / num_trials
+        resumen[f'{prefijo}_avg_memory'] = totales['memory_peak'] / 1024 / num_trials
+        resumen[f'{prefijo}_avg_calls'] = totales['function_calls'] / num_trials
+    return resumen
+
+
+def unico_exp(n: int, semilla: Optional[int] = None) -> Dict:
     """
     Ejecuta experimentos para un tamaño específico de cuadrícula.
     
     Args:
         n: Tamaño de la cuadrícula (n×n)
+        semilla: Semilla de las cuadrículas; None toma entropía del sistema,
+            de modo que dos corridas simultáneas no generan las mismas cuadrículas
     """
+    metodos = METODOS_EXPERIMENTO
+    if semilla is None:
+        semilla = semilla_entropia()
+
     print(f"\nINICIANDO EXPERIMENTO PARA n = {n}")
     print("="*60)
     print(f"Configuración:")
     print(f"   • Tamaño de cuadrícula: {n}×{n}")
     print(f"   • Máximo de movimientos: {2*n-1}")
     print(f"   • Número de pruebas: 3")
-    print(f"   • Métodos: Array 3D vs Dictionary Hash")
+    print(f"   • Métodos: {' vs '.join(nombre for nombre, _, _ in metodos)}")
+    print(f"   • Semilla: {semilla}")
     print("-"*60)
     
-    # Generar nueva semilla aleatoria para cada experimento
-    random.seed(int(time.time()))
-    
-    stats_totales = {'execution_time': 0, 'memory_peak': 0, 'function_calls': 0}
-    stats_totales_dict = {'execution_time': 0, 'memory_peak': 0, 'function_calls': 0}
+    mapas = generar_mapas(n, 3, semilla=semilla)
+    stats_totales = {prefijo: {'execution_time': 0, 'memory_peak': 0, 'function_calls': 0}
+                     for _, prefijo, _ in metodos}
+    claves_tiempo = ('tiempo_resolucion', 'tiempo_reconstruccion')
+    contadores_totales = {prefijo: dict.fromkeys(CONTADORES_MEMO + claves_tiempo, 0)
+                          for _, prefijo, _ in metodos if prefijo in METODOS_INSTRUMENTADOS}
+    tablas_totales = {'array': 0, 'array_sp': 0}
+    grids_prueba = []
     
     for j in range(3):
         print(f"\nPRUEBA {j + 1}/3")
         print("-" * 40)
         
         # Generar cuadrícula aleatoria
-        grid = random_map(n)
+        grid = next(mapas)
+        grids_prueba.append(grid)
         
         if n <= 10:  # Solo mostrar cuadrículas pequeñas
             mostrar_map(grid)
@@ -589,13 +3165,18 @@ def unico_exp(n: int) -> Dict:
         
         optimizado = alg_optimizado(grid)
         
-        print("Ejecutar método Array 3D")
-        resultado_array, stats_array, camino_opt_array = optimizado.resuelve_con_array()
-        print("Ejecutar método Dictionary Hash")
-        result_dict, stats_dict, path_dict = optimizado.resuelve_hash()
+        resultados = []
+        for nombre, prefijo, metodo in metodos:
+            print(f"Ejecutar método {nombre}")
+            # Los contadores se calculan después de medir, así que no alteran los tiempos
+            metodo = METODOS_INSTRUMENTADOS.get(prefijo, metodo)
+            resultados.append(metodo(optimizado))
+
         # Verificar consistencia de resultados
-        if resultado_array != result_dict:
-            print(f"ADVERTENCIA: Resultados inconsistentes! Array: {resultado_array}, Dict: {result_dict}")
+        resultado_array = resultados[0][0]
+        for (nombre, _, _), (resultado, _, _) in zip(metodos[1:], resultados[1:]):
+            if resultado != resultado_array:
+                print(f"ADVERTENCIA: Resultados inconsistentes! Array: {resultado_array}, {nombre}: {resultado}")
         
         # Mostrar resultados de la prueba
         print(f"\nRESULTADOS DE LA PRUEBA {j + 1}:")
@@ -603,37 +3184,50 @@ def unico_exp(n: int) -> Dict:
         print(f"\nComparación de métodos:")
         print(f"{'Método':<20} {'Tiempo (s)':<12} {'Memoria (KB)':<15} {'Llamadas':<12}")
         print("-" * 65)
-        print(f"{'Array 3D':<20} {stats_array['execution_time']:<12.6f} "
-              f"{stats_array['memory_peak']/1024:<15.2f} {stats_array['function_calls']:<12}")
-        print(f"{'Dictionary Hash':<20} {stats_dict['execution_time']:<12.6f} "
-              f"{stats_dict['memory_peak']/1024:<15.2f} {stats_dict['function_calls']:<12}")
-        
+        for (nombre, _, _), (_, stats, _) in zip(metodos, resultados):
+            print(f"{nombre:<20} {stats['execution_time']:<12.6f} "
+                  f"{stats['memory_peak']/1024:<15.2f} {stats['function_calls']:<12}")
+        for (nombre, _, _), (_, stats, _) in zip(metodos, resultados):
+            if 'memory_ratio_array3d' in stats:
+                print(f"{nombre}: pico {stats['memory_peak']/1024:.2f} KB vs tablas Array 3D "
+                      f"{stats['memory_array3d_estimada']/1024:.2f} KB "
+                      f"({stats['memory_ratio_array3d']:.2f}x)")
+            if 'memory_tablas' in stats:
+                print(f"{nombre}: tablas {stats['memory_tablas']/1024:.2f} KB vs tablas Array 3D "
+                      f"{stats['memory_array3d_estimada']/1024:.2f} KB")
+            if 'estados_podados' in stats:
+                print(f"{nombre}: {stats['estados_interseccion']:,} estados en la intersección, "
+                      f"{stats['estados_podados']:,} podados de {stats['estados_totales']:,} "
+                      f"({stats['estados_podados'] / stats['estados_totales']:.1%})")
+            if 'memo_hits' in stats:
+                print(f"{nombre}: memo {stats['memo_hits']:,} aciertos / {stats['memo_misses']:,} fallos, "
+                      f"rechazos {stats['rechazos_limite_bomba']:,} límite/bomba + "
+                      f"{stats['rechazos_tiempo']:,} tiempo, {stats['podas_alcanzable']:,} podas, "
+                      f"{stats['estados_guardados']:,} estados guardados; "
+                      f"resolución {stats['tiempo_resolucion']:.6f}s + "
+                      f"reconstrucción {stats['tiempo_reconstruccion']:.6f}s")
+
         # Mostrar camino óptimo como texto
         if n <= 20:
-            print(f"\nCAMINO ÓPTIMO - Array 3D:")
-            if camino_opt_array:
-                print(f"Longitud del camino: {len(camino_opt_array)} pasos")
-                print("Ruta: " + " -> ".join([f"({x},{y})" for x, y in camino_opt_array]))
-                # Mostrar RadAway recolectado en el camino
-                radaway_collected = sum(1 for x, y in camino_opt_array if grid[x][y] == 'R')
-                print(f"RadAway recolectado en el camino: {radaway_collected}")
-            else:
-                print("No se encontró camino válido")
-            
-            print(f"\nCAMINO ÓPTIMO - Dictionary Hash:")
-            if path_dict:
-                print(f"Longitud del camino: {len(path_dict)} pasos")
-                print("Ruta: " + " -> ".join([f"({x},{y})" for x, y in path_dict]))
-                # Mostrar RadAway recolectado en el camino
-                radaway_collected = sum(1 for x, y in path_dict if grid[x][y] == 'R')
-                print(f"RadAway recolectado en el camino: {radaway_collected}")
-            else:
-                print("No se encontró camino válido")
+            for (nombre, _, _), (_, _, camino) in zip(metodos, resultados):
+                print(f"\nCAMINO ÓPTIMO - {nombre}:")
+                if camino:
+                    print(f"Longitud del camino: {len(camino)} pasos")
+                    print("Ruta: " + " -> ".join([f"({x},{y})" for x, y in camino]))
+                    # Mostrar RadAway recolectado en el camino
+                    radaway_collected = sum(1 for x, y in camino if grid[x][y] == 'R')
+                    print(f"RadAway recolectado en el camino: {radaway_collected}")
+                else:
+                    print("No se encontró camino válido")
         
         # Acumular estadísticas
-        for key in stats_totales:
-            stats_totales[key] += stats_array[key]
-            stats_totales_dict[key] += stats_dict[key]
+        for (_, prefijo, _), (_, stats, _) in zip(metodos, resultados):
+            for key in stats_totales[prefijo]:
+                stats_totales[prefijo][key] += stats[key]
+            for key in contadores_totales.get(prefijo, {}):
+                contadores_totales[prefijo][key] += stats.get(key, 0)
+            if prefijo in tablas_totales:
+                tablas_totales[prefijo] += stats.get('bytes_tablas', 0)
     
     # Calcular y mostrar promedios
     print(f"\n{'='*60}")
@@ -641,20 +3235,47 @@ def unico_exp(n: int) -> Dict:
     print(f"{'='*60}")
     print(f"{'Método':<20} {'Tiempo (s)':<12} {'Memoria (KB)':<15} {'Llamadas':<12}")
     print("-" * 65)
-    print(f"{'Array 3D':<20} {stats_totales['execution_time']/3:<12.6f} "
-          f"{stats_totales['memory_peak']/1024/3:<15.2f} "
-          f"{stats_totales['function_calls']/3:<12.0f}")
-    print(f"{'Dictionary Hash':<20} {stats_totales_dict['execution_time']/3:<12.6f} "
-          f"{stats_totales_dict['memory_peak']/1024/3:<15.2f} "
-          f"{stats_totales_dict['function_calls']/3:<12.0f}")
+    for nombre, prefijo, _ in metodos:
+        print(f"{nombre:<20} {stats_totales[prefijo]['execution_time']/3:<12.6f} "
+              f"{stats_totales[prefijo]['memory_peak']/1024/3:<15.2f} "
+              f"{stats_totales[prefijo]['function_calls']/3:<12.0f}")
+
+    print(f"\nCONTADORES DE MEMOIZACIÓN (promedio de 3 pruebas):")
+    print(f"{'Método':<20} {'Aciertos':<10} {'Fallos':<10} {'Lím/bomba':<10} {'Tiempo':<8} "
+          f"{'Podas':<10} {'Resolución (s)':<15} {'Reconstr. (s)':<14}")
+    print("-" * 100)
+    for nombre, prefijo, _ in metodos:
+        if prefijo not in contadores_totales:
+            continue
+        c = contadores_totales[prefijo]
+        print(f"{nombre:<20} {c['memo_hits']/3:<10.0f} {c['memo_misses']/3:<10.0f} "
+              f"{c['rechazos_limite_bomba']/3:<10.0f} {c['rechazos_tiempo']/3:<8.0f} "
+              f"{c['podas_alcanzable']/3:<10.0f} {c['tiempo_resolucion']/3:<15.6f} "
+              f"{c['tiempo_reconstruccion']/3:<14.6f}")
     
     # Análisis de eficiencia
-    speedup = stats_totales['execution_time'] / stats_totales_dict['execution_time']
-    memory_ratio = stats_totales['memory_peak'] / stats_totales_dict['memory_peak']
+    stats_array, stats_dict = stats_totales['array'], stats_totales['dict']
+    speedup = stats_array['execution_time'] / stats_dict['execution_time']
+    # Sin memoria medida (las tres cuadrículas descartadas por es_factible) no hay ratio
+    memory_ratio = stats_array['memory_peak'] / stats_dict['memory_peak'] if stats_dict['memory_peak'] else 1.0
     
     print(f"\nANÁLISIS DE EFICIENCIA:")
     print(f"Speedup (Array/Dict): {speedup:.2f}x")
     print(f"Ratio de memoria (Array/Dict): {memory_ratio:.2f}x")
+    # Los tiempos anteriores incluyen el costo de tracemalloc; se repite la
+    # comparación sobre las mismas cuadrículas con medir_metodo
+    mediana_array = medir_metodo(alg_optimizado.resuelve_con_array, grids_prueba, repeticiones=3)['median_ns']
+    mediana_dict = medir_metodo(alg_optimizado.resuelve_hash, grids_prueba, repeticiones=3)['median_ns']
+    print(f"Speedup sin tracemalloc (Array/Dict, mediana perf_counter_ns): "
+          f"{mediana_array / mediana_dict:.2f}x")
+    # Misma comparación contra el hash con claves enteras y padres como códigos
+    stats_int = stats_totales['dict_int']
+    mediana_int = medir_metodo(alg_optimizado.resuelve_hash_empaquetado, grids_prueba,
+                               repeticiones=3)['median_ns']
+    if stats_int['execution_time'] > 0:
+        print(f"Speedup (Array/Hash empaquetado): "
+              f"{stats_array['execution_time'] / stats_int['execution_time']:.2f}x, "
+              f"sin tracemalloc {mediana_array / mediana_int:.2f}x")
     
     if speedup > 1:
         print("El método con Dictionary Hash es más rápido")
@@ -665,19 +3286,39 @@ def unico_exp(n: int) -> Dict:
         print("El método con Dictionary Hash usa menos memoria")
     else:
         print("El método con Array 3D usa menos memoria")
+
+    stats_vect = stats_totales['vect']
+    if stats_vect['execution_time'] > 0:
+        print(f"Speedup (Array/Vectorizado): {stats_array['execution_time'] / stats_vect['execution_time']:.2f}x")
+
+    # Ahorro de quitar parent: mismas cuadrículas, mismo recorrido, sin la tabla.
+    # Las tablas de Array 3D se reservan fuera de tracemalloc, así que se compara su
+    # tamaño real (bytes_tablas); en Dict la tabla vive dentro de la medición
+    con, sin = stats_totales['array'], stats_totales['array_sp']
+    if tablas_totales['array'] > 0 and sin['execution_time'] > 0:
+        print(f"Sin padres (Array): tablas {tablas_totales['array']/1024/3:.2f} KB -> "
+              f"{tablas_totales['array_sp']/1024/3:.2f} KB "
+              f"({1 - tablas_totales['array_sp'] / tablas_totales['array']:.1%} menos), tiempo "
+              f"{con['execution_time'] / sin['execution_time']:.2f}x")
+    con, sin = stats_totales['dict'], stats_totales['dict_sp']
+    if con['memory_peak'] > 0 and sin['execution_time'] > 0:
+        print(f"Sin padres (Dict): memoria {(con['memory_peak'] - sin['memory_peak'])/1024/3:.2f} KB "
+              f"menos ({1 - sin['memory_peak'] / con['memory_peak']:.1%}), tiempo "
+              f"{con['execution_time'] / sin['execution_time']:.2f}x")
+
+    stats_pila = stats_totales['pila']
+    if stats_pila['execution_time'] > 0:
+        print(f"Speedup (Dict/Pila): {stats_dict['execution_time'] / stats_pila['execution_time']:.2f}x "
+              f"(llamadas: {stats_dict['function_calls']} vs {stats_pila['function_calls']})")
     
     print(f"\nEXPERIMENTO PARA n = {n} COMPLETADO")
     
-    # Retornar datos para gráficos comparativos
-    return {
-        'size': n,
-        'array_avg_time': stats_totales['execution_time'] / 3,
-        'dict_avg_time': stats_totales_dict['execution_time'] / 3,
-        'array_avg_memory': stats_totales['memory_peak'] / 1024 / 3,
-        'dict_avg_memory': stats_totales_dict['memory_peak'] / 1024 / 3,
-        'array_avg_calls': stats_totales['function_calls'] / 3,
-        'dict_avg_calls': stats_totales_dict['function_calls'] / 3
-    }
+    # Retornar datos para gráficos comparativos, con los contadores promediados
+    resumen = resumen_experimento(n, stats_totales, 3)
+    for prefijo, contadores in contadores_totales.items():
+        for key, valor in contadores.items():
+            resumen[f'{prefijo}_avg_{key}'] = valor / 3
+    return resumen
 
 
 def run_all_experiments() -> None:
@@ -718,10 +3359,919 @@ def run_all_experiments() -> None:
         print("\nGenerando gráficos comparativos de rendimiento...")
         graficos_comparativos(todos_resultados)
 
-def main():
+
+def semilla_trabajo(semilla_base: int, n: int, prueba: int) -> np.random.SeedSequence:
+    """
+    Deriva la semilla de la cuadrícula de una prueba.
+
+    Depende solo de (semilla_base, n, prueba), de modo que todos los métodos de
+    una misma prueba resuelven la misma cuadrícula y las corridas son reproducibles.
+    SeedSequence mezcla las tres componentes, así que dos pruebas distintas no
+    comparten semilla sin importar cuán grandes sean n o prueba.
+
+    Returns:
+        Semilla para np.random.default_rng (y para random_map_np/generar_mapas)
+    """
+    return np.random.SeedSequence([semilla_base, n, prueba])
+
+
+def semilla_entropia() -> int:
+    """
+    Semilla base tomada de la entropía del sistema, para cuando no se indica una.
+
+    A diferencia de la hora actual, dos corridas lanzadas en el mismo segundo no
+    generan las mismas cuadrículas. Se recorta a 63 bits para que quepa en los
+    registros y la caché.
+    """
+    return int(np.random.SeedSequence().entropy % (1 << 63))
+
+
+# Una CacheResultados por archivo y por proceso, reutilizada entre trabajos
+_CACHES_PROCESO: Dict[str, 'CacheResultados'] = {}
+
+
+def _ejecutar_trabajo(n: int, prueba: int, prefijo: str, semilla: int,
+                      bomb_probability: float = 0.2,
+                      radaway_probability: float = 0.3,
+                      cache: Optional[str] = None) -> Dict:
+    """
+    Resuelve una prueba con un método dentro de un proceso trabajador.
+
+    La cuadrícula se regenera en el trabajador con semilla_trabajo(semilla, n,
+    prueba), y el tiempo y tracemalloc se miden dentro del propio método,
+    aislados del resto de los trabajos. Con `cache` (archivo sqlite) se pasa por CacheResultados y
+    el registro indica en 'cache' si hubo acierto ('memoria'/'disco') o 'miss'.
+
+    Args:
+        semilla: Semilla base de la corrida; se registra como 'seed' y, junto con
+            size y trial, identifica la cuadrícula
+
+    Returns:
+        Registro con size, trial, method, seed, resultado y las estadísticas del método
+    """
+    grid = random_map_np(n, bomb_probability, radaway_probability, semilla_trabajo(semilla, n, prueba))
+    if cache is not None:
+        if cache not in _CACHES_PROCESO:
+            _CACHES_PROCESO[cache] = CacheResultados(cache)
+        resultado, stats, _ = _CACHES_PROCESO[cache].resolver(grid, prefijo)
+    else:
+        metodo = next(m for _, p, m in METODOS_EXPERIMENTO if p == prefijo)
+        resultado, stats, _ = metodo(alg_optimizado(grid))
+    registro = {
+        'size': n,
+        'trial': prueba,
+        'method': prefijo,
+        'seed': semilla,
+        'resultado': resultado,
+        'execution_time': stats['execution_time'],
+        'memory_peak': stats['memory_peak'],
+        'function_calls': stats['function_calls']
+    }
+    if cache is not None:
+        registro['cache'] = stats['cache']
+    return registro
+
+
+def ejecutar_trabajos(len_test: List[int], num_trials: int, prefijos: List[str], semilla: int,
+                      bomb_probability: float = 0.2, radaway_probability: float = 0.3,
+                      paralelo: bool = True, max_workers: Optional[int] = None,
+                      cache: Optional[str] = None) -> List[Dict]:
+    """
+    Ejecuta todos los trabajos (n, prueba, método) sin imprimir nada.
+
+    Args:
+        len_test: Tamaños de cuadrícula
+        num_trials: Pruebas por tamaño
+        prefijos: Prefijos de METODOS_EXPERIMENTO a ejecutar
+        semilla: Semilla base (ver semilla_trabajo)
+        bomb_probability: Probabilidad de bomba de random_map_np
+        radaway_probability: Probabilidad de RadAway de random_map_np
+        paralelo: Si es True, reparte los trabajos en un ProcessPoolExecutor
+        max_workers: Procesos del pool (por defecto, uno por núcleo)
+        cache: Archivo sqlite de CacheResultados compartido por los trabajos (None = sin caché)
+
+    Returns:
+        Registros de _ejecutar_trabajo ordenados por (n, prueba, método)
+    """
+    trabajos = [(n, prueba, prefijo, semilla, bomb_probability, radaway_probability, cache)
+                for n in len_test
+                for prueba in range(num_trials)
+                for prefijo in prefijos]
+
+    if paralelo:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futuros = [pool.submit(_ejecutar_trabajo, *trabajo) for trabajo in trabajos]
+            registros = [futuro.result() for futuro in as_completed(futuros)]
+    else:
+        registros = [_ejecutar_trabajo(*trabajo) for trabajo in trabajos]
+
+    orden = {prefijo: i for i, prefijo in enumerate(prefijos)}
+    registros.sort(key=lambda r: (r['size'], r['trial'], orden[r['method']]))
+    return registros
+
+
+def resumen_cache(registros: List[Dict]) -> Dict:
+    """
+    Resume los campos 'cache' de los registros: aciertos, fallos y segundos de
+    resolución evitados (execution_time original de los registros servidos por la caché).
+    """
+    aciertos = [r for r in registros if r.get('cache') in ('memoria', 'disco')]
+    fallos = sum(1 for r in registros if r.get('cache') == 'miss')
+    return {
+        'hits': len(aciertos),
+        'misses': fallos,
+        'tiempo_ahorrado': sum(r['execution_time'] for r in aciertos)
+    }
+
+
+def resumir_registros(registros: List[Dict]) -> List[Dict]:
+    """
+    Agrupa registros de ejecutar_trabajos en resúmenes por tamaño, en el formato
+    de unico_exp, e imprime una advertencia si los métodos no coinciden en alguna prueba.
+    """
+    stats_totales: Dict[int, Dict[str, Dict]] = {}
+    pruebas: Dict[int, set] = {}
+    resultados_prueba: Dict[Tuple[int, int], Dict[str, int]] = {}
+    for registro in registros:
+        n, prefijo = registro['size'], registro['method']
+        totales = stats_totales.setdefault(n, {}).setdefault(
+            prefijo, {'execution_time': 0, 'memory_peak': 0, 'function_calls': 0})
+        for key in totales:
+            totales[key] += registro[key]
+        pruebas.setdefault(n, set()).add(registro['trial'])
+        resultados_prueba.setdefault((n, registro['trial']), {})[prefijo] = registro['resultado']
+
+    # Verificar consistencia de resultados
+    for (n, prueba), por_metodo in sorted(resultados_prueba.items()):
+        if len(set(por_metodo.values())) > 1:
+            print(f"ADVERTENCIA: Resultados inconsistentes en n = {n}, prueba {prueba + 1}: {por_metodo}",
+                  file=sys.stderr)
+
+    return [resumen_experimento(n, stats_totales[n], len(pruebas[n])) for n in stats_totales]
+
+
+def run_all_experiments_paralelo(len_test: Optional[List[int]] = None, num_trials: int = 3,
+                                 max_workers: Optional[int] = None,
+                                 semilla: Optional[int] = None,
+                                 graficar: bool = True) -> List[Dict]:
+    """
+    Ejecuta la batería de experimentos repartiendo los trabajos (n, prueba, método)
+    en un ProcessPoolExecutor.
+
+    Args:
+        len_test: Tamaños de cuadrícula (por defecto 10, 20, 30, 40)
+        num_trials: Pruebas por tamaño
+        max_workers: Procesos del pool (por defecto, uno por núcleo)
+        semilla: Semilla base; con la misma semilla se generan las mismas cuadrículas.
+            None toma entropía del sistema (se imprime para poder repetir la corrida)
+        graficar: Si es True, muestra graficos_comparativos al terminar
+
+    Returns:
+        Lista de resúmenes por tamaño, en el mismo formato que unico_exp
+    """
+    if len_test is None:
+        len_test = [10, 20, 30, 40]
+    if semilla is None:
+        semilla = semilla_entropia()
+    metodos = METODOS_EXPERIMENTO
+
+    print(f"\nINICIANDO BATERÍA PARALELA DE EXPERIMENTOS")
+    print("="*60)
+    print(f"Tamaños: {len_test} | Pruebas: {num_trials} | Semilla base: {semilla}")
+    print(f"Trabajos: {len(len_test) * num_trials * len(metodos)} | "
+          f"Procesos: {max_workers or os.cpu_count()}")
+    print("="*60)
+
+    tiempo_total = time.time()
+    registros = ejecutar_trabajos(len_test, num_trials, [prefijo for _, prefijo, _ in metodos],
+                                  semilla, max_workers=max_workers)
+    todos_resultados = resumir_registros(registros)
+
+    for resumen in todos_resultados:
+        print(f"\nRESUMEN PARA n = {resumen['size']} (promedio de {num_trials} pruebas)")
+        print(f"{'Método':<20} {'Tiempo (s)':<12} {'Memoria (KB)':<15} {'Llamadas':<12}")
+        print("-" * 65)
+        for nombre, prefijo, _ in metodos:
+            print(f"{nombre:<20} {resumen[f'{prefijo}_avg_time']:<12.6f} "
+                  f"{resumen[f'{prefijo}_avg_memory']:<15.2f} "
+                  f"{resumen[f'{prefijo}_avg_calls']:<12.0f}")
+
+    total_time = time.time() - tiempo_total
+    print(f"\n{'='*60}")
+    print(f"TODOS LOS EXPERIMENTOS COMPLETADOS")
+    print(f" Tiempo total de ejecución: {total_time:.2f} segundos")
+    print(f"{'='*60}")
+
+    if graficar and len(todos_resultados) >= 2:
+        print("\nGenerando gráficos comparativos de rendimiento...")
+        graficos_comparativos(todos_resultados)
+
+    return todos_resultados
+
+
+def benchmark_lote(n: int, num_grids: int = 200) -> Dict:
+    """
+    Compara cuadrículas por segundo entre resolver_lote y un ciclo de resuelve_con_array.
+
+    Args:
+        n: Tamaño de las cuadrículas
+        num_grids: Número de cuadrículas aleatorias a resolver con cada enfoque
+
+    Returns:
+        Diccionario con cuadrículas por segundo de cada enfoque y el speedup
+    """
+    print(f"\nBENCHMARK DE LOTES PARA n = {n} ({num_grids} cuadrículas)")
+    print("-" * 60)
+    grids = list(generar_mapas(n, num_grids))
+
+    inicio = time.perf_counter()
+    resultados_ciclo = [alg_optimizado(grid).resuelve_con_array()[0] for grid in grids]
+    tiempo_ciclo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resultados_lote = [resultado for resultado, _ in resolver_lote(grids)]
+    tiempo_lote = time.perf_counter() - inicio
+
+    if resultados_ciclo != resultados_lote:
+        print("ADVERTENCIA: Resultados inconsistentes entre el lote y el ciclo!")
+
+    por_segundo_ciclo = num_grids / tiempo_ciclo
+    por_segundo_lote = num_grids / tiempo_lote
+    print(f"{'Enfoque':<25} {'Tiempo (s)':<12} {'Cuadrículas/s':<15}")
+    print(f"{'Ciclo resuelve_con_array':<25} {tiempo_ciclo:<12.4f} {por_segundo_ciclo:<15.1f}")
+    print(f"{'resolver_lote':<25} {tiempo_lote:<12.4f} {por_segundo_lote:<15.1f}")
+    print(f"Speedup (lote/ciclo): {por_segundo_lote / por_segundo_ciclo:.2f}x")
+
+    return {
+        'size': n,
+        'loop_grids_per_s': por_segundo_ciclo,
+        'batch_grids_per_s': por_segundo_lote,
+        'speedup': por_segundo_lote / por_segundo_ciclo
+    }
+
+
+# Semilla por defecto de los corpus de benchmark_preciso: fija, para que todos los
+# métodos (incluidos los que se agreguen después) se comparen con las mismas cuadrículas
+SEMILLA_CORPUS = 20250701
+
+
+def corpus_benchmark(n: int, cantidad: int = 5, semilla: int = SEMILLA_CORPUS,
+                     bomb_probability: float = 0.2, radaway_probability: float = 0.3) -> List[np.ndarray]:
+    """
+    Genera un corpus fijo de cuadrículas (forma compacta) para un tamaño n.
+
+    La misma semilla produce siempre las mismas cuadrículas, y cada n usa su propia
+    subsemilla (semilla_trabajo), así que agregar tamaños no cambia los demás corpus.
+    """
+    return list(generar_mapas(n, cantidad, bomb_probability, radaway_probability,
+                              semilla=semilla_trabajo(semilla, n, 0), compacto=True))
+
+
+def medir_metodo(metodo: Any, corpus: List[Any], repeticiones: int = 5,
+                 calentamiento: int = 1) -> Dict:
+    """
+    Mide un método sobre un corpus separando tiempo y memoria.
+
+    Por cada cuadrícula: `calentamiento` corridas sin medir, `repeticiones` corridas
+    cronometradas con perf_counter_ns sin tracemalloc y una corrida aparte con
+    tracemalloc para memory_peak. La construcción de alg_optimizado queda fuera del
+    tiempo medido; la reserva de tablas dentro del método queda incluida.
+
+    Args:
+        metodo: Función que recibe un alg_optimizado (como en METODOS_EXPERIMENTO)
+        corpus: Cuadrículas a resolver
+        repeticiones: Corridas cronometradas por cuadrícula
+        calentamiento: Corridas previas descartadas por cuadrícula
+
+    Returns:
+        Mediana, cuartiles e IQR de todas las corridas (ns), mediana de memory_peak
+        y de function_calls, y los resultados por cuadrícula
+    """
+    tiempos_ns = []
+    memorias = []
+    llamadas = []
+    resultados = []
+    for grid in corpus:
+        for _ in range(calentamiento):
+            metodo(alg_optimizado(grid, medir_memoria=False))
+        for _ in range(repeticiones):
+            optimizado = alg_optimizado(grid, medir_memoria=False)
+            inicio = time.perf_counter_ns()
+            metodo(optimizado)
+            tiempos_ns.append(time.perf_counter_ns() - inicio)
+        resultado, stats, _ = metodo(alg_optimizado(grid))
+        memorias.append(stats['memory_peak'])
+        llamadas.append(stats['function_calls'])
+        resultados.append(resultado)
+
+    q1, mediana, q3 = np.percentile(tiempos_ns, [25, 50, 75])
+    return {
+        'runs': len(tiempos_ns),
+        'median_ns': float(mediana),
+        'q1_ns': float(q1),
+        'q3_ns': float(q3),
+        'iqr_ns': float(q3 - q1),
+        'memory_peak': float(np.median(memorias)),
+        'function_calls': float(np.median(llamadas)),
+        'resultados': resultados
+    }
+
+
+def benchmark_preciso(tamanos: List[int], prefijos: Optional[List[str]] = None, cantidad: int = 5,
+                      repeticiones: int = 5, calentamiento: int = 1, semilla: int = SEMILLA_CORPUS,
+                      bomb_probability: float = 0.2, radaway_probability: float = 0.3,
+                      mostrar: bool = True) -> List[Dict]:
+    """
+    Compara métodos de METODOS_EXPERIMENTO sobre corpus fijos con medir_metodo.
+
+    Args:
+        tamanos: Tamaños n a medir
+        prefijos: Métodos a comparar (por defecto todos)
+        cantidad: Cuadrículas por corpus
+        repeticiones: Corridas cronometradas por cuadrícula
+        calentamiento: Corridas descartadas por cuadrícula
+        semilla: Semilla de los corpus (por defecto SEMILLA_CORPUS)
+        mostrar: Si es True imprime una tabla por tamaño
+
+    Returns:
+        Un registro por (n, método) con la mediana e IQR del tiempo en ns,
+        memory_peak y function_calls medianos
+    """
+    if prefijos is None:
+        prefijos = [prefijo for _, prefijo, _ in METODOS_EXPERIMENTO]
+    nombres = {prefijo: nombre for nombre, prefijo, _ in METODOS_EXPERIMENTO}
+    metodos = {prefijo: metodo for _, prefijo, metodo in METODOS_EXPERIMENTO}
+    registros = []
+    for n in tamanos:
+        corpus = corpus_benchmark(n, cantidad, semilla, bomb_probability, radaway_probability)
+        referencia = None
+        if mostrar:
+            print(f"\nBENCHMARK n = {n} ({cantidad} cuadrículas, {repeticiones} repeticiones, "
+                  f"{calentamiento} de calentamiento, semilla {semilla})")
+            print(f"{'Método':<20} {'Mediana (ms)':<14} {'IQR (ms)':<12} {'Memoria (KB)':<14} {'Llamadas':<10}")
+            print("-" * 72)
+        for prefijo in prefijos:
+            medicion = medir_metodo(metodos[prefijo], corpus, repeticiones, calentamiento)
+            resultados = medicion.pop('resultados')
+            if referencia is None:
+                referencia = resultados
+            elif resultados != referencia:
+                print(f"ADVERTENCIA: {nombres[prefijo]} no coincide con {nombres[prefijos[0]]} en n = {n}",
+                      file=sys.stderr)
+            registro = {'size': n, 'method': prefijo, 'seed': semilla, 'grids': cantidad}
+            registro.update(medicion)
+            registros.append(registro)
+            if mostrar:
+                print(f"{nombres[prefijo]:<20} {medicion['median_ns'] / 1e6:<14.4f} "
+                      f"{medicion['iqr_ns'] / 1e6:<12.4f} {medicion['memory_peak'] / 1024:<14.2f} "
+                      f"{medicion['function_calls']:<10.0f}")
+    return registros
+
+
+def benchmark_escalado(n: int, max_procesos: Optional[int] = None, repeticiones: int = 1,
+                       semilla: int = SEMILLA_CORPUS) -> List[Dict]:
+    """
+    Mide resuelve_paralelo sobre una misma cuadrícula con 1..max_procesos procesos.
+
+    Usa la primera cuadrícula de corpus_benchmark(n) y perf_counter_ns sin
+    tracemalloc (mejor de `repeticiones`). Separa la pasada paralela por bandas
+    de la reconstrucción del camino, que es secuencial.
+
+    Args:
+        n: Tamaño de la cuadrícula
+        max_procesos: Máximo de procesos a probar (por defecto, núcleos disponibles)
+        repeticiones: Corridas por cantidad de procesos
+        semilla: Semilla del corpus
+
+    Returns:
+        Un registro por cantidad de procesos con tiempos, speedup y eficiencia
+    """
+    max_procesos = max_procesos or os.cpu_count() or 1
+    grid = corpus_benchmark(n, 1, semilla)[0]
+    print(f"\nESCALADO DE resuelve_paralelo PARA n = {n} ({os.cpu_count()} núcleos disponibles)")
+    print(f"{'Procesos':<10} {'Tiempo (s)':<12} {'Bandas (s)':<12} {'Camino (s)':<12} "
+          f"{'Speedup':<10} {'Eficiencia':<10}")
+    print("-" * 70)
+    registros = []
+    base = None
+    for procesos in range(1, max_procesos + 1):
+        mejor = None
+        for _ in range(repeticiones):
+            optimizado = alg_optimizado(grid, medir_memoria=False)
+            inicio = time.perf_counter_ns()
+            resultado, stats, _ = optimizado.resuelve_paralelo(procesos)
+            tiempo = (time.perf_counter_ns() - inicio) / 1e9
+            if mejor is None or tiempo < mejor[0]:
+                mejor = (tiempo, stats)
+        tiempo, stats = mejor
+        base = base or tiempo
+        registro = {
+            'size': n,
+            'procesos': procesos,
+            'resultado': resultado,
+            'tiempo': tiempo,
+            'tiempo_frente': stats['tiempo_frente'],
+            'tiempo_camino': stats['tiempo_camino'],
+            'speedup': base / tiempo,
+            'eficiencia': base / tiempo / procesos
+        }
+        registros.append(registro)
+        print(f"{procesos:<10} {tiempo:<12.3f} {stats['tiempo_frente']:<12.3f} "
+              f"{stats['tiempo_camino']:<12.3f} {registro['speedup']:<10.2f} {registro['eficiencia']:<10.2f}")
+    return registros
+
+
+def grid_desde_solicitud(datos: Any) -> List[List[str]]:
+    """
+    Convierte la cuadrícula de una solicitud JSON (lista de filas, cada una un
+    string como "..R.B" o una lista de símbolos) en lista de listas.
+
+    Raises:
+        ValueError: Si no es cuadrada o contiene símbolos distintos de '.', 'R' y 'B'
+    """
+    if not isinstance(datos, list) or not datos:
+        raise ValueError("'grid' debe ser una lista de filas no vacía")
+    grid = [list(fila) for fila in datos]
+    n = len(grid)
+    if any(len(fila) != n for fila in grid):
+        raise ValueError(f"La cuadrícula no es de {n}×{n}")
+    if any(celda not in ('.', 'R', 'B') for fila in grid for celda in fila):
+        raise ValueError("La cuadrícula contiene símbolos distintos de '.', 'R' y 'B'")
+    return grid
+
+
+class ServicioSolver:
+    """
+    Servicio asyncio local que resuelve cuadrículas recibidas como líneas JSON.
+
+    Protocolo (una línea JSON por mensaje, por TCP o socket Unix):
+      - {"id": ..., "grid": ["..R", ".B.", "R.."]} -> {"id": ..., "resultado": int, "camino": [[x, y], ...]}
+      - {"id": ..., "cmd": "stats"} -> {"id": ..., "stats": estadisticas()}
+      - Solicitud inválida -> {"id": ..., "error": "..."}
+
+    Las solicitudes del mismo n que llegan dentro de `ventana` segundos se agrupan
+    y se resuelven juntas con resolver_lote en un pool de procesos, de modo que el
+    costo de cada capa vectorizada se comparte entre todo el grupo.
+    """
+
+    def __init__(self, ventana: float = 0.005, tam_lote: int = 256,
+                 max_workers: Optional[int] = None, executor: Any = None):
+        """
+        Args:
+            ventana: Segundos que se espera a más solicitudes del mismo n antes de despachar
+            tam_lote: Tamaño de grupo que se despacha sin esperar a que termine la ventana
+            max_workers: Procesos del pool (por defecto, uno por núcleo)
+            executor: Executor alternativo (por ejemplo un ThreadPoolExecutor)
+        """
+        self.ventana = ventana
+        self.tam_lote = tam_lote
+        self._executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+        self._pendientes: Dict[int, List[Tuple[List[List[str]], 'asyncio.Future']]] = {}
+        self._temporizadores: Dict[int, 'asyncio.TimerHandle'] = {}
+        self.latencias_ms: deque = deque(maxlen=10000)
+        self.solicitudes = 0
+        self.respuestas = 0
+        self.errores = 0
+        self.lotes = 0
+        self.cuadriculas_en_lotes = 0
+        self.inicio = time.perf_counter()
+
+    async def resolver(self, grid: List[List[str]]) -> Tuple[int, list]:
+        """Encola una cuadrícula en el grupo de su n y espera su (máximo_cápsulas, camino)."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        n = len(grid)
+        pendientes = self._pendientes.setdefault(n, [])
+        pendientes.append((grid, futuro))
+        if len(pendientes) >= self.tam_lote:
+            self._despachar(n)
+        elif len(pendientes) == 1:
+            self._temporizadores[n] = loop.call_later(self.ventana, self._despachar, n)
+        return await futuro
+
+    def _despachar(self, n: int) -> None:
+        """Envía el grupo pendiente de tamaño n al pool."""
+        import asyncio
+        temporizador = self._temporizadores.pop(n, None)
+        if temporizador is not None:
+            temporizador.cancel()
+        grupo = self._pendientes.pop(n, [])
+        if not grupo:
+            return
+        self.lotes += 1
+        self.cuadriculas_en_lotes += len(grupo)
+        loop = asyncio.get_running_loop()
+        tarea = loop.run_in_executor(self._executor, resolver_lote, [grid for grid, _ in grupo])
+        tarea.add_done_callback(lambda hecho: self._entregar(grupo, hecho))
+
+    @staticmethod
+    def _entregar(grupo: List[Tuple[Any, 'asyncio.Future']], hecho: 'asyncio.Future') -> None:
+        """Reparte los resultados (o el error) del lote a cada solicitud."""
+        error = hecho.exception()
+        for i, (_, futuro) in enumerate(grupo):
+            if futuro.done():
+                continue
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(hecho.result()[i])
+
+    async def _responder(self, linea: bytes, writer: 'asyncio.StreamWriter') -> None:
+        """Atiende una línea JSON y escribe su respuesta."""
+        inicio = time.perf_counter()
+        self.solicitudes += 1
+        id_solicitud = None
+        try:
+            solicitud = json.loads(linea)
+            id_solicitud = solicitud.get('id')
+            if solicitud.get('cmd') == 'stats':
+                respuesta = {'id': id_solicitud, 'stats': self.estadisticas()}
+            else:
+                grid = grid_desde_solicitud(solicitud.get('grid'))
+                resultado, camino = await self.resolver(grid)
+                respuesta = {'id': id_solicitud, 'resultado': resultado,
+                             'camino': [list(posicion) for posicion in camino]}
+                self.latencias_ms.append((time.perf_counter() - inicio) * 1000)
+            self.respuestas += 1
+        except Exception as error:  # la conexión sigue viva ante solicitudes inválidas
+            self.errores += 1
+            respuesta = {'id': id_solicitud, 'error': str(error)}
+        writer.write((json.dumps(respuesta) + "\n").encode())
+        await writer.drain()
+
+    async def atender(self, reader: 'asyncio.StreamReader', writer: 'asyncio.StreamWriter') -> None:
+        """Lee líneas de una conexión; cada una se atiende en su propia tarea."""
+        import asyncio
+        tareas = set()
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                tarea = asyncio.create_task(self._responder(linea, writer))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def estadisticas(self) -> Dict:
+        """
+        Contadores del servicio: solicitudes, respuestas, errores, lotes, tamaño
+        medio de lote, throughput (respuestas por segundo desde el inicio) y
+        percentiles de latencia de las últimas 10000 resoluciones.
+        """
+        duracion = time.perf_counter() - self.inicio
+        stats = {
+            'solicitudes': self.solicitudes,
+            'respuestas': self.respuestas,
+            'errores': self.errores,
+            'lotes': self.lotes,
+            'lote_promedio': self.cuadriculas_en_lotes / self.lotes if self.lotes else 0.0,
+            'throughput_rps': self.respuestas / duracion if duracion > 0 else 0.0,
+            'latencia_p50_ms': 0.0,
+            'latencia_p95_ms': 0.0,
+            'latencia_p99_ms': 0.0
+        }
+        if self.latencias_ms:
+            p50, p95, p99 = np.percentile(list(self.latencias_ms), [50, 95, 99])
+            stats.update(latencia_p50_ms=float(p50), latencia_p95_ms=float(p95), latencia_p99_ms=float(p99))
+        return stats
+
+    async def iniciar(self, host: str = '127.0.0.1', puerto: int = 8765,
+                      ruta_unix: Optional[str] = None) -> 'asyncio.AbstractServer':
+        """Abre el servidor TCP (o el socket Unix si se indica `ruta_unix`)."""
+        import asyncio
+        if ruta_unix is not None:
+            return await asyncio.start_unix_server(self.atender, path=ruta_unix)
+        return await asyncio.start_server(self.atender, host, puerto)
+
+    def cerrar(self) -> None:
+        """Libera el pool de procesos."""
+        self._executor.shutdown(wait=True)
+
+
+def servir(host: str = '127.0.0.1', puerto: int = 8765, ruta_unix: Optional[str] = None,
+           ventana: float = 0.005, max_workers: Optional[int] = None) -> None:
+    """
+    Ejecuta ServicioSolver hasta Ctrl+C.
+    """
+    import asyncio
+    servicio = ServicioSolver(ventana=ventana, max_workers=max_workers)
+
+    async def principal() -> None:
+        servidor = await servicio.iniciar(host, puerto, ruta_unix)
+        direccion = ruta_unix or f"{host}:{puerto}"
+        print(f"Servicio de resolución escuchando en {direccion} (ventana {ventana * 1000:.1f} ms)",
+              file=sys.stderr)
+        async with servidor:
+            await servidor.serve_forever()
+
+    try:
+        asyncio.run(principal())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servicio.cerrar()
+
+
+async def generar_carga(host: str = '127.0.0.1', puerto: int = 8765, ruta_unix: Optional[str] = None,
+                        solicitudes: int = 1000, concurrencia: int = 32, tamanos: Optional[List[int]] = None,
+                        semilla: int = SEMILLA_CORPUS, bomb_probability: float = 0.2,
+                        radaway_probability: float = 0.3) -> Dict:
+    """
+    Genera carga contra ServicioSolver con cuadrículas de random_map_np.
+
+    Abre `concurrencia` conexiones; cada una envía su parte de las solicitudes y
+    espera cada respuesta antes de enviar la siguiente.
+
+    Returns:
+        Latencias vistas por el cliente (p50/p95/p99 en ms), throughput, errores y
+        las estadísticas que reporta el servicio al terminar
+    """
+    import asyncio
+    tamanos = tamanos or [10, 20]
+    # Generador propio: no re-siembra el módulo random de quien llama
+    rng = np.random.default_rng(semilla)
+    grids = [random_map_np(tamanos[i % len(tamanos)], bomb_probability, radaway_probability, rng)
+             for i in range(solicitudes)]
+    latencias_ms: List[float] = []
+    errores = 0
+
+    async def conectar() -> Tuple['asyncio.StreamReader', 'asyncio.StreamWriter']:
+        if ruta_unix is not None:
+            return await asyncio.open_unix_connection(ruta_unix)
+        return await asyncio.open_connection(host, puerto)
+
+    async def cliente(indices: range) -> None:
+        nonlocal errores
+        reader, writer = await conectar()
+        for i in indices:
+            solicitud = {'id': i, 'grid': [''.join(fila) for fila in grids[i]]}
+            inicio = time.perf_counter()
+            writer.write((json.dumps(solicitud) + "\n").encode())
+            await writer.drain()
+            respuesta = json.loads(await reader.readline())
+            latencias_ms.append((time.perf_counter() - inicio) * 1000)
+            if 'error' in respuesta:
+                errores += 1
+        writer.close()
+        await writer.wait_closed()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(range(c, solicitudes, concurrencia)) for c in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+
+    reader, writer = await conectar()
+    writer.write(b'{"cmd": "stats"}\n')
+    await writer.drain()
+    stats_servicio = json.loads(await reader.readline())['stats']
+    writer.close()
+    await writer.wait_closed()
+
+    p50, p95, p99 = np.percentile(latencias_ms, [50, 95, 99])
+    return {
+        'solicitudes': solicitudes,
+        'concurrencia': concurrencia,
+        'errores': errores,
+        'duracion': duracion,
+        'throughput_rps': solicitudes / duracion,
+        'latencia_p50_ms': float(p50),
+        'latencia_p95_ms': float(p95),
+        'latencia_p99_ms': float(p99),
+        'servicio': stats_servicio
+    }
+
+
+def escribir_registros(registros: List[Dict], resumenes: List[Dict], formato: str, destino) -> None:
+    """
+    Escribe los resultados de la línea de comandos en un formato legible por máquinas.
+
+    Args:
+        registros: Un registro por trabajo (n, prueba, método) de ejecutar_trabajos
+        resumenes: Promedios por tamaño de resumir_registros
+        formato: 'json' (registros y resúmenes), 'jsonl' (un registro por línea),
+            'csv' (un registro por fila) o 'table' (resumen para humanos)
+        destino: Archivo de texto abierto donde escribir
+    """
+    if formato == 'json':
+        json.dump({'runs': registros, 'summary': resumenes}, destino, indent=2)
+        destino.write("\n")
+    elif formato == 'jsonl':
+        for registro in registros:
+            destino.write(json.dumps(registro) + "\n")
+    elif formato == 'csv':
+        escritor = csv.DictWriter(destino, fieldnames=list(registros[0]) if registros else [])
+        escritor.writeheader()
+        escritor.writerows(registros)
+    else:
+        nombres = {prefijo: nombre for nombre, prefijo, _ in METODOS_EXPERIMENTO}
+        prefijos = list(dict.fromkeys(registro['method'] for registro in registros))
+        for resumen in resumenes:
+            destino.write(f"\nn = {resumen['size']}\n")
+            destino.write(f"{'Método':<20} {'Tiempo (s)':<12} {'Memoria (KB)':<15} {'Llamadas':<12}\n")
+            destino.write("-" * 65 + "\n")
+            for prefijo in prefijos:
+                destino.write(f"{nombres[prefijo]:<20} {resumen[f'{prefijo}_avg_time']:<12.6f} "
+                              f"{resumen[f'{prefijo}_avg_memory']:<15.2f} "
+                              f"{resumen[f'{prefijo}_avg_calls']:<12.0f}\n")
+
+
+def construir_parser() -> argparse.ArgumentParser:
+    """
+    Define las opciones de la ejecución no interactiva.
+    """
+    prefijos = [prefijo for _, prefijo, _ in METODOS_EXPERIMENTO]
+    parser = argparse.ArgumentParser(
+        description="Escape del Refugio Fallout - experimentos de programación dinámica. "
+                    "Sin argumentos se abre el menú interactivo.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 30, 40],
+                        help="Tamaños n de cuadrícula (por defecto: 10 20 30 40)")
+    parser.add_argument('--trials', type=int, default=3,
+                        help="Pruebas por tamaño (por defecto: 3)")
+    parser.add_argument('--methods', nargs='+', choices=prefijos, default=prefijos,
+                        help="Métodos a comparar (por defecto: todos)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Semilla base para generar las cuadrículas (por defecto: entropía del "
+                             "sistema, que se informa por stderr)")
+    parser.add_argument('--bomb-prob', type=float, default=0.2,
+                        help="Probabilidad de bomba por celda (por defecto: 0.2)")
+    parser.add_argument('--radaway-prob', type=float, default=0.3,
+                        help="Probabilidad de RadAway por celda (por defecto: 0.3)")
+    parser.add_argument('--format', choices=['table', 'json', 'jsonl', 'csv'], default='table',
+                        help="Formato de salida (por defecto: table)")
+    parser.add_argument('--output', default='-',
+                        help="Archivo de salida ('-' para la salida estándar)")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Repartir los trabajos en un ProcessPoolExecutor")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos del pool con --parallel (por defecto: uno por núcleo)")
+    parser.add_argument('--no-plot', action='store_true',
+                        help="No mostrar los gráficos comparativos")
+    parser.add_argument('--grid', nargs='+', default=None, metavar='ARCHIVO',
+                        help="Resolver cuadrículas guardadas (texto de mostrar_map o binario) "
+                             "en lugar de generarlas al azar")
+    parser.add_argument('--cache', default=None, metavar='ARCHIVO',
+                        help="Archivo sqlite de CacheResultados para no volver a resolver "
+                             "cuadrículas ya resueltas")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Medir con benchmark_preciso: corpus fijo de --trials cuadrículas, "
+                             "tiempos sin tracemalloc (mediana e IQR) y memoria en una corrida aparte")
+    parser.add_argument('--scaling', action='store_true',
+                        help="Medir el escalado de resuelve_paralelo (una cuadrícula por --sizes) "
+                             "con 1..--workers procesos")
+    parser.add_argument('--repeats', type=int, default=5,
+                        help="Corridas cronometradas por cuadrícula con --benchmark (por defecto: 5)")
+    parser.add_argument('--warmup', type=int, default=1,
+                        help="Corridas de calentamiento por cuadrícula con --benchmark (por defecto: 1)")
+    parser.add_argument('--serve', action='store_true',
+                        help="Levantar ServicioSolver (líneas JSON por TCP o socket Unix)")
+    parser.add_argument('--load-test', type=int, default=None, metavar='SOLICITUDES',
+                        help="Enviar SOLICITUDES cuadrículas de random_map (tamaños --sizes) a un "
+                             "ServicioSolver ya levantado y reportar latencias y throughput")
+    parser.add_argument('--concurrency', type=int, default=32,
+                        help="Conexiones simultáneas con --load-test (por defecto: 32)")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Dirección del servicio (por defecto: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765,
+                        help="Puerto TCP del servicio (por defecto: 8765)")
+    parser.add_argument('--socket', default=None, metavar='RUTA',
+                        help="Usar un socket Unix en RUTA en lugar de TCP")
+    parser.add_argument('--batch-window', type=float, default=5.0,
+                        help="Milisegundos que el servicio agrupa solicitudes del mismo n (por defecto: 5)")
+    return parser
+
+
+def resolver_archivos(rutas: List[str], prefijos: List[str]) -> List[Dict]:
+    """
+    Resuelve cuadrículas guardadas en disco con cada método indicado.
+
+    Returns:
+        Registros con el mismo formato que los de ejecutar_trabajos, más la ruta del archivo
+    """
+    registros = []
+    for prueba, ruta in enumerate(rutas):
+        grid = cargar_grid(ruta)
+        for prefijo in prefijos:
+            metodo = next(m for _, p, m in METODOS_EXPERIMENTO if p == prefijo)
+            resultado, stats, _ = metodo(alg_optimizado(grid))
+            registros.append({
+                'grid': ruta,
+                'size': len(grid),
+                'trial': prueba,
+                'method': prefijo,
+                'seed': None,
+                'resultado': resultado,
+                'execution_time': stats['execution_time'],
+                'memory_peak': stats['memory_peak'],
+                'function_calls': stats['function_calls']
+            })
+    return registros
+
+
+def ejecutar_cli(argv: List[str]) -> int:
+    """
+    Ejecuta los experimentos indicados por línea de comandos, sin entrada interactiva.
+
+    Returns:
+        Código de salida del proceso
+    """
+    args = construir_parser().parse_args(argv)
+
+    if args.serve:
+        servir(args.host, args.port, args.socket, ventana=args.batch_window / 1000,
+               max_workers=args.workers)
+        return 0
+
+    if args.load_test is not None:
+        import asyncio
+        semilla = args.seed if args.seed is not None else SEMILLA_CORPUS
+        carga = asyncio.run(generar_carga(args.host, args.port, args.socket, args.load_test,
+                                          args.concurrency, args.sizes, semilla,
+                                          args.bomb_prob, args.radaway_prob))
+        if args.format == 'table':
+            servicio = carga['servicio']
+            print(f"{carga['solicitudes']} solicitudes con {carga['concurrencia']} conexiones "
+                  f"en {carga['duracion']:.3f} s: {carga['throughput_rps']:.1f} solicitudes/s, "
+                  f"{carga['errores']} errores")
+            print(f"Latencia cliente p50/p95/p99: {carga['latencia_p50_ms']:.2f} / "
+                  f"{carga['latencia_p95_ms']:.2f} / {carga['latencia_p99_ms']:.2f} ms")
+            print(f"Servicio: {servicio['lotes']} lotes, {servicio['lote_promedio']:.1f} cuadrículas por lote, "
+                  f"p99 {servicio['latencia_p99_ms']:.2f} ms")
+        else:
+            print(json.dumps(carga, indent=2))
+        return 0
+
+    if args.scaling:
+        semilla = args.seed if args.seed is not None else SEMILLA_CORPUS
+        for n in args.sizes:
+            benchmark_escalado(n, args.workers, semilla=semilla)
+        return 0
+
+    if args.benchmark:
+        # La tabla se imprime mientras se mide; los demás formatos van a --output
+        semilla = args.seed if args.seed is not None else SEMILLA_CORPUS
+        registros = benchmark_preciso(args.sizes, args.methods, cantidad=args.trials,
+                                      repeticiones=args.repeats, calentamiento=args.warmup,
+                                      semilla=semilla, bomb_probability=args.bomb_prob,
+                                      radaway_probability=args.radaway_prob,
+                                      mostrar=args.format == 'table')
+        if args.format != 'table':
+            if args.output == '-':
+                escribir_registros(registros, [], args.format, sys.stdout)
+            else:
+                with open(args.output, 'w', newline='', encoding='utf-8') as destino:
+                    escribir_registros(registros, [], args.format, destino)
+        return 0
+
+    semilla = args.seed
+    if semilla is None and not args.grid:
+        semilla = semilla_entropia()
+        # stderr para no mezclarla con la salida csv/json; también queda en 'seed'
+        print(f"Semilla base: {semilla}", file=sys.stderr)
+
+    if args.grid:
+        registros = resolver_archivos(args.grid, args.methods)
+    else:
+        registros = ejecutar_trabajos(args.sizes, args.trials, args.methods, semilla,
+                                      args.bomb_prob, args.radaway_prob,
+                                      paralelo=args.parallel, max_workers=args.workers,
+                                      cache=args.cache)
+    resumenes = resumir_registros(registros)
+    if args.cache:
+        uso = resumen_cache(registros)
+        print(f"Caché {args.cache}: {uso['hits']} aciertos, {uso['misses']} fallos, "
+              f"{uso['tiempo_ahorrado']:.4f} s de resolución evitados", file=sys.stderr)
+
+    if args.output == '-':
+        escribir_registros(registros, resumenes, args.format, sys.stdout)
+    else:
+        with open(args.output, 'w', newline='', encoding='utf-8') as destino:
+            escribir_registros(registros, resumenes, args.format, destino)
+
+    if not args.no_plot and len(resumenes) >= 2:
+        graficos_comparativos(resumenes)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None):
     """
     Función principal que maneja el menú interactivo y la ejecución del programa.
+
+    Con argumentos de línea de comandos ejecuta los experimentos sin menú
+    (ver construir_parser); sin argumentos abre el menú interactivo.
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        return ejecutar_cli(argv)
+
     print("Tarea 2 - Análisis de Algoritmos 2025")
     print("Problema de Optimización: Escape del Refugio Fallout")
     print("Implementación con Programación Dinámica y Memoización")
@@ -740,6 +4290,11 @@ def main():
         elif opcion == 5:
             run_all_experiments()
         elif opcion == 6:
+            for n in [10, 20, 30, 40]:
+                benchmark_lote(n)
+        elif opcion == 7:
+            run_all_experiments_paralelo()
+        elif opcion == 8:
             print("\n¡Gracias por usar el programa!")
             print("Programa desarrollado para Análisis de Algoritmos 2025")
             break
@@ -761,4 +4316,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
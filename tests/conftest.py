@@ -0,0 +1,17 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+_RUTA_MODULO = os.path.join(os.path.dirname(__file__), os.pardir, 'Fallout-ada.py')
+
+
+@pytest.fixture(scope='session')
+def fallout():
+    # El nombre del módulo tiene un guion: se carga desde la ruta
+    spec = importlib.util.spec_from_file_location('fallout_ada', _RUTA_MODULO)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules['fallout_ada'] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
@@ -0,0 +1,24 @@
+"""Pruebas de las máscaras de alcanzables por paso (alcanzables_por_paso)."""
+import random
+
+
+def test_mascaras_coinciden_con_recorrido_por_estados(fallout):
+    random.seed(17)
+    for _ in range(60):
+        n = random.randint(1, 8)
+        grid = fallout.random_map(n, random.choice([0.0, 0.2, 0.4]), 0.3)
+        opt = fallout.alg_optimizado(grid)
+        capas = opt.alcanzables_por_paso()
+        assert len(capas) == opt.max_steps + 1
+
+        # Recorrido explícito de estados: el destino se alcanza pero no se expande
+        libres = {(x, y) for x in range(n) for y in range(n) if grid[x][y] != 'B'}
+        frontera = {(0, 0)} & libres
+        for t in range(opt.max_steps + 1):
+            for x in range(n):
+                for y in range(n):
+                    bit = bool((capas[t] >> (x * (n + 1) + y)) & 1)
+                    assert bit == ((x, y) in frontera)
+                    assert opt.alcanzable_bits(x, y, t) == (bit and opt.es_alcanzable(x, y, t))
+            frontera = {(x + dx, y + dy) for x, y in frontera if (x, y) != (n - 1, n - 1)
+                        for dx, dy in opt.directions} & libres
@@ -0,0 +1,30 @@
+"""Pruebas de CacheResultados con varios escritores sobre el mismo archivo sqlite."""
+import sqlite3
+
+
+def _bytes_guardados(ruta):
+    with sqlite3.connect(ruta) as conexion:
+        return conexion.execute("SELECT COALESCE(SUM(tam), 0) FROM resultados").fetchone()[0]
+
+
+def test_dos_escritores_respetan_max_bytes(fallout, tmp_path):
+    ruta = str(tmp_path / 'cache.sqlite')
+    escritores = [fallout.CacheResultados(ruta, capacidad=1, max_bytes=2000) for _ in range(2)]
+    valor = (3, {'execution_time': 0.001, 'memory_peak': 10, 'function_calls': 5, 'method': 'Array 3D'},
+             [(0, 0), (0, 1), (1, 1)])
+    for i in range(40):
+        escritores[i % 2].guardar(f'clave{i}', valor)
+        assert _bytes_guardados(ruta) <= 2000
+    assert escritores[0].estadisticas()['bytes_disco'] == _bytes_guardados(ruta)
+    # La entrada más reciente sobrevive al desalojo y la ve el otro escritor
+    assert escritores[0].obtener('clave39') is not None
+    for cache in escritores:
+        cache.cerrar()
+
+
+def test_entrada_mayor_que_el_limite_no_se_guarda(fallout, tmp_path):
+    ruta = str(tmp_path / 'cache.sqlite')
+    cache = fallout.CacheResultados(ruta, capacidad=1, max_bytes=10)
+    cache.guardar('grande', (1, {'execution_time': 0.0}, [(0, 0)]))
+    assert _bytes_guardados(ruta) == 0
+    cache.cerrar()
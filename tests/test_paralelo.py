@@ -0,0 +1,23 @@
+"""Pruebas de resuelve_paralelo ante la caída de un proceso trabajador."""
+import multiprocessing
+import os
+import signal
+
+import pytest
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="el trabajador reemplazado solo llega al hijo con fork")
+def test_trabajador_muerto_no_cuelga_al_padre(fallout, monkeypatch):
+    original = fallout._trabajador_frente
+
+    def trabajador_que_muere(nombre, n, T, k, x0, x1, barrera):
+        if x0 == 0:
+            # Muere sin pasar por el except que rompe la barrera
+            os.kill(os.getpid(), signal.SIGKILL)
+        original(nombre, n, T, k, x0, x1, barrera)
+
+    monkeypatch.setattr(fallout, '_trabajador_frente', trabajador_que_muere)
+    grid = fallout.random_map_np(12, 0.1, 3)
+    with pytest.raises(RuntimeError):
+        fallout.alg_optimizado(grid).resuelve_paralelo(num_procesos=3)
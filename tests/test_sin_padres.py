@@ -0,0 +1,17 @@
+"""Pruebas de la reconstrucción del camino sin tabla parent (sin_padres=True)."""
+import random
+
+import pytest
+
+
+@pytest.mark.parametrize('metodo', ['resuelve_con_array', 'resuelve_hash', 'resuelve_pila'])
+@pytest.mark.parametrize('podar', [False, True])
+def test_mismo_valor_y_camino_que_con_parent(fallout, metodo, podar):
+    random.seed(11)
+    for _ in range(60):
+        grid = fallout.random_map(random.randint(2, 9), random.choice([0.0, 0.15, 0.3]), 0.4)
+        con_parent = getattr(fallout.alg_optimizado(grid), metodo)(podar=podar)
+        sin_parent = getattr(fallout.alg_optimizado(grid), metodo)(podar=podar, sin_padres=True)
+        assert sin_parent[0] == con_parent[0]
+        assert sin_parent[2] == con_parent[2]
+        assert sin_parent[1]['function_calls'] == con_parent[1]['function_calls']